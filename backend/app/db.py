@@ -0,0 +1,66 @@
+import os
+import logging
+from typing import Optional
+from urllib.parse import quote, unquote
+from pymongo import AsyncMongoClient
+
+logger = logging.getLogger(__name__)
+
+# One client (and connection pool) per process, shared by the app and the scripts
+_client: Optional[AsyncMongoClient] = None
+
+def escape_mongodb_url(url: str) -> str:
+    """Percent-escape the username and password of a MongoDB connection URL.
+
+    The credentials are split off at the last ``@`` before any URL parsing, so
+    passwords containing ``@``, ``/``, ``?`` or ``#`` are escaped too. Already-
+    escaped credentials are left as-is, and multi-host lists
+    (``host1:27017,host2:27017``) are preserved untouched.
+    """
+    scheme, sep, rest = url.partition("://")
+    userinfo, at, hosts = rest.rpartition("@")
+    if not sep or not at:
+        return url
+    username, colon, password = userinfo.partition(":")
+    userinfo = quote(unquote(username), safe="")
+    if colon:
+        userinfo += ":" + quote(unquote(password), safe="")
+    return f"{scheme}://{userinfo}@{hosts}"
+
+def redact_mongodb_url(url: str) -> str:
+    """Return ``url`` with the password masked, for logging."""
+    scheme, sep, rest = url.partition("://")
+    userinfo, at, hosts = rest.rpartition("@")
+    if not sep or not at:
+        return url
+    username, colon, _ = userinfo.partition(":")
+    return f"{scheme}://{username}{':***' if colon else ''}@{hosts}"
+
+def get_client(url: Optional[str] = None) -> AsyncMongoClient:
+    """
+    Return the process-wide MongoDB client, creating it on first use.
+    ``url`` defaults to MONGODB_URL and is only consulted on that first call.
+    """
+    global _client
+    if _client is None:
+        mongodb_url = url or os.getenv("MONGODB_URL", "mongodb://localhost:27017/rag_chat")
+
+        # Process MONGODB_URL to escape username and password if present
+        mongodb_url = escape_mongodb_url(mongodb_url)
+
+        _client = AsyncMongoClient(
+            mongodb_url,
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL", "10")),
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL", "100")),
+            maxConnecting=4,
+            serverSelectionTimeoutMS=5000,
+            tz_aware=True
+        )
+    return _client
+
+async def close_client() -> None:
+    """Close the shared client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
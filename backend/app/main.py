@@ -1,15 +1,14 @@
 import os
 import logging
-from urllib.parse import quote_plus
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
 
+from .db import get_client, close_client
 from .models import User, Conversation, Message
 from .services.api_client import RagApiClient
-from .services.chat_service import ChatService
+from .services.chat_service import ChatService, drain_background_tasks
 from .routers import chat, ingestion, auth, admin, evaluation
 
 
@@ -25,30 +24,48 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Indexes the hot query paths depend on (login/auth, conversation list, history)
+EXPECTED_INDEXES = {
+    User: [(("email", 1),)],
+    Conversation: [(("user.$id", 1), ("updated_at", -1))],
+    Message: [(("conversation.$id", 1), ("timestamp", 1))],
+}
+
+async def warn_missing_indexes():
+    """Log a warning for any expected index that is missing from the database."""
+    for model, expected in EXPECTED_INDEXES.items():
+        info = await model.get_pymongo_collection().index_information()
+        present = {
+            tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                  for field, direction in spec["key"])
+            for spec in info.values()
+        }
+        for keys in expected:
+            if keys not in present:
+                logger.warning(f"Missing index {list(keys)} on '{model.get_collection_name()}'; queries will scan the collection")
+
 @app.on_event("startup")
 async def startup_event():
-    # Initialize Beanie
-    mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017/rag_chat")
-    
-    # Process MONGODB_URL to escape username and password if present
-    if "://" in mongodb_url and "@" in mongodb_url:
-        try:
-            scheme, rest = mongodb_url.split("://", 1)
-            userinfo, host_rest = rest.rsplit("@", 1)
-            if ":" in userinfo:
-                username, password = userinfo.split(":", 1)
-                mongodb_url = f"{scheme}://{quote_plus(username)}:{quote_plus(password)}@{host_rest}"
-            else:
-                mongodb_url = f"{scheme}://{quote_plus(userinfo)}@{host_rest}"
-        except Exception as e:
-            logger.warning(f"Failed to parse MONGODB_URL for escaping: {e}")
-
-    client = AsyncIOMotorClient(mongodb_url)
+    # Initialize Beanie on the shared client
+    client = get_client()
+    # Open the pool now so the first requests don't pay the connection handshake
+    await client.admin.command("ping")
     await init_beanie(
         database=client.get_default_database(),
         document_models=[User, Conversation, Message]
     )
     logger.info("Beanie initialized with MongoDB")
+    await warn_missing_indexes()
+
+    # Every RAG API call, including admin health probes, shares this client's pool
+    await api_client.startup()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Let streamed replies still being saved finish before the Mongo client closes
+    await drain_background_tasks()
+    await api_client.aclose()
+    await close_client()
 
 # CORS configuration
 app.add_middleware(
@@ -68,10 +85,8 @@ chat_service = ChatService(api_client=api_client)
 
 # Set services in routers
 chat.set_chat_service(chat_service)
-ingestion.set_api_client(api_client)
-
-
-evaluation.set_api_client(api_client)
+# Ingestion, evaluation and admin routes resolve the client via the get_api_client dependency
+app.state.api_client = api_client
 
 # Include routers
 app.include_router(auth.router)
@@ -91,4 +106,17 @@ async def health():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # One process by default. Extra workers are an explicit WEB_CONCURRENCY
+    # opt-in: each runs its own startup hook (own Mongo and HTTP client pools),
+    # and the in-process caches (users, tokens, conversation owners, admin
+    # stats) are per worker, so invalidations only reach the worker that made
+    # the write. The auth user cache is switched off by default in that mode.
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8001,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+    )
@@ -1,7 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
-from beanie import Document, Indexed, Link
+from beanie import Document, Indexed, Link, PydanticObjectId
 from pydantic import Field, EmailStr
+from pymongo import IndexModel
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
 
 class User(Document):
     email: Indexed(EmailStr, unique=True)
@@ -11,25 +15,58 @@ class User(Document):
     is_admin: bool = False
     role: str = "user"  # "user" | "admin" | "superadmin"
     last_login: Optional[datetime] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("created_at", -1)]),
+            IndexModel([("last_login", -1)]),
+            IndexModel([("role", 1), ("is_active", 1)]),
+        ]
 
 class Conversation(Document):
     title: str
     user: Link[User]
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
+    # Denormalized for list views; maintained by record_messages()
+    message_count: int = 0
+    user_email_cache: Optional[str] = None
+
+    @classmethod
+    async def record_messages(cls, conversation_id: PydanticObjectId, count: int = 1, at: Optional[datetime] = None):
+        """Atomically bump message_count and updated_at (``at``, default now) after inserting messages."""
+        await cls.get_pymongo_collection().update_one(
+            {"_id": conversation_id},
+            {"$inc": {"message_count": count}, "$set": {"updated_at": at or utc_now()}}
+        )
+
+    @classmethod
+    async def owned_by(cls, conversation_id: PydanticObjectId, user_id: PydanticObjectId) -> bool:
+        """Existence and ownership in one indexed lookup that reads back only the _id."""
+        return await cls.get_pymongo_collection().find_one(
+            {"_id": conversation_id, "user.$id": user_id}, {"_id": 1}
+        ) is not None
 
     class Settings:
         name = "conversations"
+        indexes = [
+            IndexModel([("user.$id", 1), ("updated_at", -1)]),
+            IndexModel([("created_at", -1)]),
+            IndexModel([("updated_at", -1)]),
+            IndexModel([("title", 1)]),
+        ]
 
 class Message(Document):
     conversation: Link[Conversation]
     role: str # user or assistant
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
 
     class Settings:
         name = "messages"
+        indexes = [
+            IndexModel([("conversation.$id", 1), ("timestamp", 1)]),
+            IndexModel([("timestamp", -1)]),
+        ]
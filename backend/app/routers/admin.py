@@ -1,18 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import List, Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from beanie import PydanticObjectId
 from beanie.operators import In
-from ..models import User, Conversation, Message
+from ..models import User, Conversation, Message, utc_now
 from ..services.authorization import require_admin
-from ..services.auth import get_password_hash, get_current_user
-from ..services.api_client import RagApiClient
-import httpx
+from ..services.auth import aget_password_hash, get_current_user, invalidate_user
+from ..services.api_client import RagApiClient, get_api_client
+from ..services.chat_service import forget_conversation
+import asyncio
+import orjson
 import os
+import re
+import time
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
 
-
 # ============================================================================
 # Pydantic Models for Request/Response
 # ============================================================================
@@ -27,6 +32,21 @@ class UserResponse(BaseModel):
     last_login: Optional[datetime]
     created_at: datetime
 
+class UserListItem(BaseModel):
+    """Projection for user listings; never loads hashed_password."""
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool = True
+    is_admin: bool = False
+    role: str = "user"
+    last_login: Optional[datetime] = None
+    created_at: datetime
+
+class UserEmailView(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+
 class UserUpdateRequest(BaseModel):
     full_name: Optional[str] = None
     is_active: Optional[bool] = None
@@ -36,6 +56,34 @@ class UserUpdateRequest(BaseModel):
 class PasswordResetRequest(BaseModel):
     new_password: str
 
+class ConversationSummary(BaseModel):
+    id: PydanticObjectId
+    title: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    message_count: int = 0
+    user_id: str
+    user_email: str
+
+class ConversationPage(BaseModel):
+    total: int
+    items: List[ConversationSummary]
+    skip: int
+    limit: int
+
+class MessageView(BaseModel):
+    role: str
+    content: str
+    timestamp: datetime
+
+class ActivityItem(BaseModel):
+    type: str
+    timestamp: datetime
+    data: Dict[str, Any]
+
+class ActivityResponse(BaseModel):
+    activity: List[ActivityItem]
+
 class StatsResponse(BaseModel):
     users: Dict[str, Any]
     conversations: Dict[str, Any]
@@ -44,6 +92,11 @@ class StatsResponse(BaseModel):
     etl: Dict[str, Any]
 
 
+def _link_id(field: str) -> Dict[str, Any]:
+    """Aggregation expression for the ObjectId stored in a Link (DBRef) field."""
+    return {"$getField": {"field": {"$literal": "$id"}, "input": f"${field}"}}
+
+
 # ============================================================================
 # User Management Endpoints
 # ============================================================================
@@ -72,18 +125,20 @@ async def list_users(
     if is_active is not None:
         query["is_active"] = is_active
 
-    # Get total count
-    total = await User.find(query).count()
-
-    # Get paginated users
-    users = await User.find(query).skip(skip).limit(limit).to_list()
+    # Get total count and paginated users concurrently
+    total, users = await asyncio.gather(
+        User.find(query).count(),
+        User.find(query, projection_model=UserListItem).skip(skip).limit(limit).to_list()
+    )
 
     return {
         "total": total,
         "skip": skip,
         "limit": limit,
+        # Rows were already decoded and validated through the UserListItem
+        # projection, so skip re-running EmailStr/field validation per row.
         "users": [
-            UserResponse(
+            UserResponse.model_construct(
                 id=str(user.id),
                 email=user.email,
                 full_name=user.full_name,
@@ -139,6 +194,7 @@ async def update_user(user_id: str, update_data: UserUpdateRequest):
         user.is_admin = update_data.role in ["admin", "superadmin"]
 
     await user.save()
+    invalidate_user(user.email)
 
     return UserResponse(
         id=str(user.id),
@@ -175,19 +231,22 @@ async def delete_user(user_id: str, current_user: User = Depends(get_current_use
                 detail="Cannot delete the last active superadmin."
             )
 
-    # 1. Find all conversations for this user
-    conversations = await Conversation.find(Conversation.user.id == user.id).to_list()
-    conv_ids = [c.id for c in conversations]
+    # 1. Collect the user's conversation ids without decoding the documents
+    conversations = Conversation.get_pymongo_collection()
+    conv_ids = await conversations.distinct("_id", {"user.$id": user.id})
 
-    # 2. Delete all messages in those conversations
+    # 2. Delete their messages and the conversations themselves concurrently
     if conv_ids:
-        await Message.find(In(Message.conversation.id, conv_ids)).delete()
-
-    # 3. Delete the conversations
-    await Conversation.find(Conversation.user.id == user.id).delete()
+        await asyncio.gather(
+            Message.get_pymongo_collection().delete_many({"conversation.$id": {"$in": conv_ids}}),
+            conversations.delete_many({"user.$id": user.id})
+        )
+        for conv_id in conv_ids:
+            forget_conversation(conv_id)
 
-    # 4. Finally delete the user
+    # 3. Finally delete the user
     await user.delete()
+    invalidate_user(user.email)
 
     return {"message": f"User {user.email} and all associated data deleted permanently"}
 
@@ -200,8 +259,9 @@ async def admin_reset_password(user_id: str, reset_data: PasswordResetRequest):
         raise HTTPException(status_code=404, detail="User not found")
 
     # Hash and update password
-    user.hashed_password = get_password_hash(reset_data.new_password)
+    user.hashed_password = await aget_password_hash(reset_data.new_password)
     await user.save()
+    invalidate_user(user.email)
 
     return {"message": "Password reset successfully"}
 
@@ -210,43 +270,46 @@ async def admin_reset_password(user_id: str, reset_data: PasswordResetRequest):
 # Statistics Endpoints
 # ============================================================================
 
-@router.get("/stats", response_model=StatsResponse)
-async def get_dashboard_stats():
-    """Get comprehensive dashboard statistics."""
-    now = datetime.utcnow()
-    today_start = datetime(now.year, now.month, now.day)
-    week_start = now - timedelta(days=7)
+# Dashboards poll these endpoints; serve them from a short-lived cache of
+# key -> (expires_at, task). Concurrent callers await the same in-flight task,
+# so N pollers cost one computation (and one upstream request) per TTL.
+STATS_CACHE_TTL = float(os.getenv("ADMIN_STATS_CACHE_TTL", "15"))
+ETL_JOBS_CACHE_TTL = 5.0
+HEALTH_CACHE_TTL = 2.0
+_cache: Dict[str, Tuple[float, "asyncio.Future[Any]"]] = {}
 
-    # User statistics
-    total_users = await User.find().count()
-    active_users = await User.find({"is_active": True}).count()
-    new_users_today = await User.find({"created_at": {"$gte": today_start}}).count()
-    new_users_week = await User.find({"created_at": {"$gte": week_start}}).count()
 
-    # Conversation statistics
-    total_conversations = await Conversation.find().count()
-    conversations_today = await Conversation.find({"created_at": {"$gte": today_start}}).count()
-    conversations_week = await Conversation.find({"created_at": {"$gte": week_start}}).count()
-    avg_conversations_per_user = total_conversations / total_users if total_users > 0 else 0
+async def _cached(key: str, ttl: float, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the value for ``key``, computing it at most once per ``ttl`` seconds."""
+    # No await between lookup and insert, so this is race-free on the event loop
+    entry = _cache.get(key)
+    if entry is None or time.monotonic() >= entry[0]:
+        entry = (time.monotonic() + ttl, asyncio.ensure_future(compute()))
+        _cache[key] = entry
+
+    try:
+        # Shield so one cancelled caller doesn't cancel the shared computation
+        return await asyncio.shield(entry[1])
+    except Exception:
+        # Don't cache failures; the next caller retries
+        if _cache.get(key) is entry:
+            del _cache[key]
+        raise
 
-    # Message statistics
-    total_messages = await Message.find().count()
-    messages_today = await Message.find({"timestamp": {"$gte": today_start}}).count()
-    messages_week = await Message.find({"timestamp": {"$gte": week_start}}).count()
-    avg_messages_per_conversation = total_messages / total_conversations if total_conversations > 0 else 0
 
-    # System health (check RAG API, MongoDB is implicitly working if we got here)
-    rag_api_status = "online"
+async def _check_rag_api_status(api_client: RagApiClient) -> str:
+    """Probe the RAG API health endpoint (MongoDB is implicitly working if we got here)."""
     try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{rag_api_url}/health")
-            if response.status_code != 200:
-                rag_api_status = "degraded"
+        response = await _cached("rag_api_health", HEALTH_CACHE_TTL, lambda: api_client.probe("/health"))
+        if response.status_code != 200:
+            return "degraded"
     except Exception:
-        rag_api_status = "offline"
+        return "offline"
+    return "online"
 
-    # ETL statistics (from rag-qa-api)
+
+async def _get_etl_stats(api_client: RagApiClient) -> Dict[str, int]:
+    """Summarize ETL job states from rag-qa-api."""
     etl_stats = {
         "total_jobs": 0,
         "pending": 0,
@@ -255,9 +318,7 @@ async def get_dashboard_stats():
         "failed": 0
     }
     try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        client = RagApiClient(base_url=rag_api_url)
-        jobs = await client.list_ingest_jobs()
+        jobs = await _cached("etl_jobs", ETL_JOBS_CACHE_TTL, api_client.list_ingest_jobs)
         etl_stats["total_jobs"] = len(jobs)
         for job in jobs:
             status_lower = job.get("status", "").lower()
@@ -272,6 +333,45 @@ async def get_dashboard_stats():
     except Exception as e:
         # ETL API unavailable, return zeros
         pass
+    return etl_stats
+
+
+async def _compute_dashboard_stats(api_client: RagApiClient) -> StatsResponse:
+    now = utc_now()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = now - timedelta(days=7)
+
+    # All counts and upstream checks are independent, so run them concurrently
+    (
+        total_users,
+        active_users,
+        new_users_today,
+        new_users_week,
+        total_conversations,
+        conversations_today,
+        conversations_week,
+        total_messages,
+        messages_today,
+        messages_week,
+        rag_api_status,
+        etl_stats
+    ) = await asyncio.gather(
+        User.get_pymongo_collection().estimated_document_count(),
+        User.find({"is_active": True}).count(),
+        User.find({"created_at": {"$gte": today_start}}).count(),
+        User.find({"created_at": {"$gte": week_start}}).count(),
+        Conversation.get_pymongo_collection().estimated_document_count(),
+        Conversation.find({"created_at": {"$gte": today_start}}).count(),
+        Conversation.find({"created_at": {"$gte": week_start}}).count(),
+        Message.get_pymongo_collection().estimated_document_count(),
+        Message.find({"timestamp": {"$gte": today_start}}).count(),
+        Message.find({"timestamp": {"$gte": week_start}}).count(),
+        _check_rag_api_status(api_client),
+        _get_etl_stats(api_client)
+    )
+
+    avg_conversations_per_user = total_conversations / total_users if total_users > 0 else 0
+    avg_messages_per_conversation = total_messages / total_conversations if total_conversations > 0 else 0
 
     return StatsResponse(
         users={
@@ -301,26 +401,50 @@ async def get_dashboard_stats():
     )
 
 
-@router.get("/stats/users")
-async def get_user_stats():
-    """Get detailed user analytics (growth, activity)."""
-    now = datetime.utcnow()
+@router.get("/stats", response_model=StatsResponse)
+async def get_dashboard_stats(api_client: RagApiClient = Depends(get_api_client)):
+    """Get comprehensive dashboard statistics."""
+    return await _cached("dashboard", STATS_CACHE_TTL, lambda: _compute_dashboard_stats(api_client))
 
-    # Get user growth over last 30 days
-    growth_data = []
-    for i in range(30, -1, -1):
-        date = now - timedelta(days=i)
-        date_start = datetime(date.year, date.month, date.day)
-        date_end = date_start + timedelta(days=1)
 
-        count = await User.find({
-            "created_at": {"$gte": date_start, "$lt": date_end}
-        }).count()
+@router.post("/stats/invalidate")
+async def invalidate_stats_cache():
+    """Drop cached statistics so the next request recomputes them."""
+    _cache.clear()
+    return {"message": "Statistics cache cleared"}
+
 
-        growth_data.append({
+async def _daily_counts(document_model, field: str, days: int = 30) -> List[Dict[str, Any]]:
+    """
+    Count documents per day on ``field`` over the last ``days`` days.
+    Uses a single aggregation and fills empty days with zero.
+    """
+    start = utc_now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+
+    buckets = await document_model.aggregate([
+        {"$match": {field: {"$gte": start}}},
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": f"${field}", "unit": "day"}},
+            "count": {"$sum": 1}
+        }}
+    ]).to_list()
+    counts = {bucket["_id"]: bucket["count"] for bucket in buckets}
+
+    data = []
+    for i in range(days + 1):
+        date_start = start + timedelta(days=i)
+        data.append({
             "date": date_start.isoformat(),
-            "count": count
+            "count": counts.get(date_start, 0)
         })
+    return data
+
+
+async def _compute_user_stats() -> Dict[str, Any]:
+    now = utc_now()
+
+    # Get user growth over last 30 days
+    growth_data = await _daily_counts(User, "created_at")
 
     # Active users (logged in last 7 days)
     week_ago = now - timedelta(days=7)
@@ -331,70 +455,59 @@ async def get_user_stats():
     return {
         "growth_data": growth_data,
         "active_users_last_7_days": active_users,
-        "total_users": await User.find().count()
+        "total_users": await User.get_pymongo_collection().estimated_document_count()
     }
 
 
-@router.get("/stats/conversations")
-async def get_conversation_stats():
-    """Get conversation metrics and trends."""
-    now = datetime.utcnow()
-
+async def _compute_conversation_stats() -> Dict[str, Any]:
     # Conversations over last 30 days
-    conversation_data = []
-    for i in range(30, -1, -1):
-        date = now - timedelta(days=i)
-        date_start = datetime(date.year, date.month, date.day)
-        date_end = date_start + timedelta(days=1)
-
-        count = await Conversation.find({
-            "created_at": {"$gte": date_start, "$lt": date_end}
-        }).count()
-
-        conversation_data.append({
-            "date": date_start.isoformat(),
-            "count": count
-        })
+    conversation_data = await _daily_counts(Conversation, "created_at")
 
     return {
         "conversation_data": conversation_data,
-        "total_conversations": await Conversation.find().count()
+        "total_conversations": await Conversation.get_pymongo_collection().estimated_document_count()
     }
 
 
-@router.get("/stats/messages")
-async def get_message_stats():
-    """Get message volume trends."""
-    now = datetime.utcnow()
-
+async def _compute_message_stats() -> Dict[str, Any]:
     # Messages over last 30 days
-    message_data = []
-    for i in range(30, -1, -1):
-        date = now - timedelta(days=i)
-        date_start = datetime(date.year, date.month, date.day)
-        date_end = date_start + timedelta(days=1)
-
-        count = await Message.find({
-            "timestamp": {"$gte": date_start, "$lt": date_end}
-        }).count()
-
-        message_data.append({
-            "date": date_start.isoformat(),
-            "count": count
-        })
+    message_data = await _daily_counts(Message, "timestamp")
 
     return {
         "message_data": message_data,
-        "total_messages": await Message.find().count()
+        "total_messages": await Message.get_pymongo_collection().estimated_document_count()
     }
 
 
+def _today_key() -> str:
+    """Date bucket for trend caches, so they rotate at midnight (UTC)."""
+    return utc_now().date().isoformat()
+
+
+@router.get("/stats/users")
+async def get_user_stats():
+    """Get detailed user analytics (growth, activity)."""
+    return await _cached(f"users:{_today_key()}", STATS_CACHE_TTL, _compute_user_stats)
+
+
+@router.get("/stats/conversations")
+async def get_conversation_stats():
+    """Get conversation metrics and trends."""
+    return await _cached(f"conversations:{_today_key()}", STATS_CACHE_TTL, _compute_conversation_stats)
+
+
+@router.get("/stats/messages")
+async def get_message_stats():
+    """Get message volume trends."""
+    return await _cached(f"messages:{_today_key()}", STATS_CACHE_TTL, _compute_message_stats)
+
+
 # ============================================================================
 # System Monitoring Endpoints
 # ============================================================================
 
 @router.get("/system/health")
-async def get_system_health():
+async def get_system_health(api_client: RagApiClient = Depends(get_api_client)):
     """Get detailed system health status."""
     health_status = {
         "mongodb": {"status": "online", "message": "Connected"},
@@ -402,41 +515,37 @@ async def get_system_health():
         "qdrant": {"status": "unknown", "message": "Not checked"}
     }
 
+    # Probe the RAG API and Qdrant concurrently; cached so pollers share one probe
+    rag_result, qdrant_result = await asyncio.gather(
+        _cached("rag_api_health", HEALTH_CACHE_TTL, lambda: api_client.probe("/health")),
+        _cached("qdrant_health", HEALTH_CACHE_TTL, lambda: api_client.probe("/qdrant/health")),
+        return_exceptions=True
+    )
+
     # Check RAG API
-    try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{rag_api_url}/health")
-            if response.status_code == 200:
-                health_status["rag_api"] = {"status": "online", "message": "Healthy"}
-            else:
-                health_status["rag_api"] = {"status": "degraded", "message": f"Status code: {response.status_code}"}
-    except Exception as e:
-        health_status["rag_api"] = {"status": "offline", "message": str(e)}
+    if isinstance(rag_result, Exception):
+        health_status["rag_api"] = {"status": "offline", "message": str(rag_result)}
+    elif rag_result.status_code == 200:
+        health_status["rag_api"] = {"status": "online", "message": "Healthy"}
+    else:
+        health_status["rag_api"] = {"status": "degraded", "message": f"Status code: {rag_result.status_code}"}
 
     # Check Qdrant (via RAG API)
-    try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Assume RAG API has a qdrant health endpoint
-            response = await client.get(f"{rag_api_url}/qdrant/health")
-            if response.status_code == 200:
-                health_status["qdrant"] = {"status": "online", "message": "Healthy"}
-            else:
-                health_status["qdrant"] = {"status": "degraded", "message": "Unable to verify"}
-    except Exception as e:
+    if isinstance(qdrant_result, Exception):
         health_status["qdrant"] = {"status": "unknown", "message": "Endpoint not available"}
+    elif qdrant_result.status_code == 200:
+        health_status["qdrant"] = {"status": "online", "message": "Healthy"}
+    else:
+        health_status["qdrant"] = {"status": "degraded", "message": "Unable to verify"}
 
     return health_status
 
 
 @router.get("/integrations")
-async def get_all_integrations():
+async def get_all_integrations(api_client: RagApiClient = Depends(get_api_client)):
     """Get all integrations across all users (admin view)."""
     try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        client = RagApiClient(base_url=rag_api_url)
-        integrations = await client.list_integrations()
+        integrations = await api_client.list_integrations()
         return {"integrations": integrations}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch integrations: {str(e)}")
@@ -446,13 +555,12 @@ async def get_all_integrations():
 async def get_all_etl_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    status_filter: Optional[str] = None
+    status_filter: Optional[str] = None,
+    api_client: RagApiClient = Depends(get_api_client)
 ):
     """Get all ETL jobs with filtering and pagination."""
     try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        client = RagApiClient(base_url=rag_api_url)
-        all_jobs = await client.list_ingest_jobs()
+        all_jobs = await _cached("etl_jobs", ETL_JOBS_CACHE_TTL, api_client.list_ingest_jobs)
 
         # Filter by status if provided
         if status_filter:
@@ -472,14 +580,23 @@ async def get_all_etl_jobs(
         raise HTTPException(status_code=500, detail=f"Failed to fetch ETL jobs: {str(e)}")
 
 
-@router.get("/activity")
+@router.get("/activity", response_model=ActivityResponse)
 async def get_recent_activity(limit: int = Query(50, ge=1, le=100)):
     """Get recent user activity across the system."""
-    # Get recent user registrations
-    recent_users = await User.find().sort(-User.created_at).limit(limit).to_list()
+    # Get recent user registrations and conversations
+    recent_users, recent_conversations = await asyncio.gather(
+        User.find(projection_model=UserListItem).sort(-User.created_at).limit(limit).to_list(),
+        Conversation.find().sort(-Conversation.created_at).limit(limit).to_list()
+    )
 
-    # Get recent conversations
-    recent_conversations = await Conversation.find().sort(-Conversation.created_at).limit(limit).to_list()
+    # Resolve conversation owners with one batched query instead of a fetch per row
+    owner_ids = list({conv.user.ref.id for conv in recent_conversations if conv.user})
+    owners = {}
+    if owner_ids:
+        owners = {
+            owner.id: owner.email
+            for owner in await User.find(In(User.id, owner_ids), projection_model=UserEmailView).to_list()
+        }
 
     # Combine and sort by timestamp
     activity = []
@@ -496,14 +613,13 @@ async def get_recent_activity(limit: int = Query(50, ge=1, le=100)):
         })
 
     for conv in recent_conversations:
-        await conv.fetch_link(Conversation.user)
         activity.append({
             "type": "conversation_created",
             "timestamp": conv.created_at,
             "data": {
                 "conversation_id": str(conv.id),
                 "title": conv.title,
-                "user_email": conv.user.email if conv.user else "Unknown"
+                "user_email": owners.get(conv.user.ref.id, "Unknown") if conv.user else "Unknown"
             }
         })
 
@@ -513,7 +629,30 @@ async def get_recent_activity(limit: int = Query(50, ge=1, le=100)):
     return {"activity": activity[:limit]}
 
 
-@router.get("/conversations", response_model=Dict[str, Any])
+def _title_search(search: str) -> Dict[str, str]:
+    """Case-insensitive substring match on the title, so partial words match as you type"""
+    return {"$regex": re.escape(search), "$options": "i"}
+
+
+def _conversation_page_pipeline(query: Dict[str, Any], skip: int, limit: int) -> List[Dict[str, Any]]:
+    """Aggregation for one page of conversations, reading the denormalized counters."""
+    return [
+        {"$match": query},
+        {"$sort": {"updated_at": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": {
+            "title": 1,
+            "created_at": 1,
+            "updated_at": 1,
+            "message_count": 1,
+            "user_email_cache": 1,
+            "user_id": _link_id("user")
+        }}
+    ]
+
+
+@router.get("/conversations", response_model=ConversationPage)
 async def list_all_conversations(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
@@ -525,63 +664,72 @@ async def list_all_conversations(
     
     query = {}
     if search:
-        query["title"] = {"$regex": search, "$options": "i"}
+        query["title"] = _title_search(search)
 
     try:
-        # Get total count for pagination
-        total = await Conversation.find(query).count()
-        
-        # Get paginated data
-        conversations = await Conversation.find(query).sort(-Conversation.updated_at).skip(skip).limit(limit).to_list()
-        
-        result = []
-        for conv in conversations:
-            try:
-                # Basic info
-                conv_data = {
-                    "id": str(conv.id),
-                    "title": conv.title or "Untitled Conversation",
-                    "created_at": conv.created_at.isoformat() if conv.created_at else None,
-                    "updated_at": conv.updated_at.isoformat() if conv.updated_at else None,
-                    "message_count": 0,
-                    "user_id": "unknown",
-                    "user_email": "Unknown"
-                }
-                
-                # Fetch user link safely
-                try:
-                    await conv.fetch_link("user")
-                    if conv.user and hasattr(conv.user, 'email'):
-                         conv_data["user_email"] = conv.user.email
-                         conv_data["user_id"] = str(conv.user.id)
-                except Exception:
-                    pass
-                
-                # Fetch message count (Beanie style)
-                try:
-                    conv_data["message_count"] = await Message.find(Message.conversation.id == conv.id).count()
-                except Exception:
-                    # Fallback to direct mongo link format
-                    conv_data["message_count"] = await Message.find({"conversation.$id": conv.id}).count()
-                
-                result.append(conv_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing individual conversation {conv.id}: {e}")
-                continue
+        # message_count and user_email_cache are maintained on write, so a
+        # page is a single indexed read with no joins or per-row counts
+        total, conversations = await asyncio.gather(
+            Conversation.find(query).count(),
+            Conversation.aggregate(_conversation_page_pipeline(query, skip, limit)).to_list()
+        )
 
-        return {
-            "total": total,
-            "items": result,
-            "skip": skip,
-            "limit": limit
-        }
+        # Rows come straight from the database, so build them without
+        # re-validation and let the response model encode ids/datetimes.
+        result = [
+            ConversationSummary.model_construct(
+                id=conv["_id"],
+                title=conv.get("title") or "Untitled Conversation",
+                created_at=conv.get("created_at"),
+                updated_at=conv.get("updated_at"),
+                message_count=conv.get("message_count", 0),
+                user_id=str(conv["user_id"]) if conv.get("user_id") else "unknown",
+                user_email=conv.get("user_email_cache") or "Unknown"
+            )
+            for conv in conversations
+        ]
+
+        return ConversationPage.model_construct(
+            total=total,
+            items=result,
+            skip=skip,
+            limit=limit
+        )
     except Exception as e:
         logger.error(f"Critical error in list_all_conversations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/conversations/{conv_id}/messages", response_model=List[Dict[str, Any]])
+@router.get("/conversations.ndjson")
+async def stream_all_conversations(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    search: Optional[str] = None
+):
+    """Stream conversations as newline-delimited JSON, one row per line."""
+    query = {}
+    if search:
+        query["title"] = _title_search(search)
+
+    async def rows():
+        cursor = await Conversation.get_pymongo_collection().aggregate(
+            _conversation_page_pipeline(query, skip, limit)
+        )
+        async for conv in cursor:
+            yield orjson.dumps({
+                "id": str(conv["_id"]),
+                "title": conv.get("title") or "Untitled Conversation",
+                "created_at": conv.get("created_at"),
+                "updated_at": conv.get("updated_at"),
+                "message_count": conv.get("message_count", 0),
+                "user_id": str(conv["user_id"]) if conv.get("user_id") else "unknown",
+                "user_email": conv.get("user_email_cache") or "Unknown"
+            }) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@router.get("/conversations/{conv_id}/messages", response_model=List[MessageView])
 async def get_conversation_messages(conv_id: str):
     """Get all messages for a specific conversation (Admin view)."""
     conversation = await Conversation.get(conv_id)
@@ -590,20 +738,15 @@ async def get_conversation_messages(conv_id: str):
 
     messages = await Message.find(Message.conversation.id == conversation.id).sort(Message.timestamp).to_list()
     return [
-        {
-            "role": m.role,
-            "content": m.content,
-            "timestamp": m.timestamp.isoformat()
-        } for m in messages
+        MessageView.model_construct(role=m.role, content=m.content, timestamp=m.timestamp)
+        for m in messages
     ]
 
 
 @router.get("/feedback")
-async def get_all_feedback():
+async def get_all_feedback(api_client: RagApiClient = Depends(get_api_client)):
     """Get all user feedback from rag-qa-api."""
     try:
-        rag_api_url = os.getenv("RAG_API_URL", "http://localhost:8000")
-        client = RagApiClient(base_url=rag_api_url)
-        return await client.get_all_feedback()
+        return await api_client.get_all_feedback()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch feedback: {str(e)}")
@@ -1,30 +1,32 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
-from jose import JWTError, jwt
 
 from ..models import User
 from ..services.auth import (
-    verify_password, 
+    averify_password,
+    aget_password_hash,
     get_password_hash, 
     create_access_token, 
-    SECRET_KEY, 
-    ALGORITHM,
     get_current_user,
-    oauth2_scheme
+    get_user_by_email,
+    invalidate_user
 )
+from ..services.authorization import require_admin
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-from ..services.authorization import require_admin
-
 class UserRegister(BaseModel):
     email: EmailStr
     password: str
     full_name: Optional[str] = None
     role: str = "user"
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _lowercase_email(cls, v: str) -> str:
+        return v.lower()
+
 class UserResponse(BaseModel):
     email: str
     full_name: Optional[str] = None
@@ -37,17 +39,18 @@ class Token(BaseModel):
 
 @router.post("/register", response_model=UserResponse)
 async def register(user_in: UserRegister, current_user: User = Depends(require_admin)):
-    email = user_in.email.lower()
-    existing_user = await User.find_one(User.email == email)
+    existing_user = await User.find_one(User.email == user_in.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Check if this is the first user (bootstrap admin) - OPTIONAL safeguard, but better handled by script
     # However, since we now require admin to call this, bootstrapping must happen via script.
     
+    # bcrypt is CPU-bound; hash off the event loop so streams on this worker keep flowing
+    hashed_password = await aget_password_hash(user_in.password)
     user = User(
-        email=email,
-        hashed_password=get_password_hash(user_in.password),
+        email=user_in.email,
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         role=user_in.role,
         is_admin=(user_in.role in ["admin", "superadmin"])
@@ -60,23 +63,27 @@ async def register(user_in: UserRegister, current_user: User = Depends(require_a
         role=user.role
     )
 
+# Verified against when the email is unknown; hashed once at import with the live cost factor
+_DUMMY_HASH = get_password_hash("timing-equalizer")
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _lowercase_email(cls, v: str) -> str:
+        return v.lower()
+
 @router.post("/login", response_model=Token)
 async def login(request: LoginRequest):
-    email = request.email.lower()
-    user = await User.find_one(User.email == email)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    if not verify_password(request.password, user.hashed_password):
+    user = await get_user_by_email(request.email)
+
+    # Verify against a throwaway hash when the user is missing, so unknown
+    # emails take as long as wrong passwords and can't be enumerated by timing
+    hashed_password = user.hashed_password if user else _DUMMY_HASH
+    password_ok = await averify_password(request.password, hashed_password)
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -104,6 +111,7 @@ async def update_profile(user_update: UserUpdate, current_user: User = Depends(g
         current_user.full_name = user_update.full_name
     
     await current_user.save()
+    invalidate_user(current_user.email)
     return UserResponse(
         email=current_user.email,
         full_name=current_user.full_name,
@@ -117,18 +125,24 @@ class PasswordReset(BaseModel):
 
 @router.post("/reset-password")
 async def reset_password(pw_reset: PasswordReset, current_user: User = Depends(get_current_user)):
-    if not verify_password(pw_reset.old_password, current_user.hashed_password):
+    if not await averify_password(pw_reset.old_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect old password"
         )
     
-    current_user.hashed_password = get_password_hash(pw_reset.new_password)
+    current_user.hashed_password = await aget_password_hash(pw_reset.new_password)
     await current_user.save()
+    invalidate_user(current_user.email)
     return {"message": "Password updated successfully"}
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _lowercase_email(cls, v: str) -> str:
+        return v.lower()
+
 @router.post("/forgot-password")
 async def forgot_password(request: ForgotPasswordRequest):
     # In a real app, this would send an email
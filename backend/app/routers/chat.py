@@ -1,14 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
+from datetime import datetime
 import logging
+import orjson
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 logger = logging.getLogger(__name__)
 
 from ..services.auth import get_current_user
+from ..services.chat_service import forget_conversation
 from ..models import User, Conversation, Message
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
 
 # Global chat service instance
 _chat_service = None
@@ -45,12 +50,39 @@ class QueryResponse(BaseModel):
 class ConversationResponse(BaseModel):
     id: str
     title: str
-    updated_at: str
+    updated_at: datetime
 
 class MessageResponse(BaseModel):
     role: str
     content: str
-    timestamp: str
+    timestamp: datetime
+
+# Projections so list endpoints only fetch the fields they return
+class ConversationListItem(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    updated_at: datetime
+
+class MessageListItem(BaseModel):
+    role: str
+    content: str
+    timestamp: datetime
+
+def _parse_conversation_id(conv_id: str) -> PydanticObjectId:
+    try:
+        return PydanticObjectId(conv_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+async def _owned_conversation_id(conv_id: str, user: User) -> PydanticObjectId:
+    """
+    Check existence and ownership in one indexed query, reading only the _id
+    (the DBRef to the owner is matched in the filter, never dereferenced).
+    """
+    oid = _parse_conversation_id(conv_id)
+    if not await Conversation.owned_by(oid, user.id):
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return oid
 
 @router.post("/query", response_model=QueryResponse)
 async def query_chat(
@@ -102,8 +134,7 @@ async def query_chat_stream(
                 yield event
         except Exception as e:
             logger.error(f"Error in streaming chat: {e}")
-            error_data = json.dumps({"event": "error", "error": str(e)})
-            yield f"data: {error_data}\n\n"
+            yield b"data: " + orjson.dumps({"event": "error", "error": str(e)}) + b"\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -116,33 +147,24 @@ async def query_chat_stream(
     )
 
 @router.get("/conversations", response_model=List[ConversationResponse])
-async def list_conversations(current_user: User = Depends(get_current_user)):
+async def list_conversations(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user)
+):
     try:
-        # Strategy 1: Standard Beanie Link ID query
+        # Conversation.user is stored as a DBRef; served by the (user.$id, updated_at) index
         conversations = await Conversation.find(
-            Conversation.user.id == current_user.id
-        ).sort(-Conversation.updated_at).to_list()
-        
-        # Strategy 2: Raw MongoDB DBRef query (fallback)
-        if not conversations:
-            conversations = await Conversation.find({
-                "user.$id": current_user.id
-            }).sort(-Conversation.updated_at).to_list()
-            
-        # Strategy 3: Direct User object comparison (fallback)
-        if not conversations:
-            conversations = await Conversation.find(
-                Conversation.user == current_user
-            ).sort(-Conversation.updated_at).to_list()
+            {"user.$id": current_user.id}, projection_model=ConversationListItem
+        ).sort(-Conversation.updated_at).skip(skip).limit(limit).to_list()
             
         logger.info(f"List conversations for {current_user.email} (ID: {current_user.id}): Found {len(conversations)}")
         
+        # Projected rows are already validated; skip re-validation and let the
+        # response model serialize datetimes in its compiled encoder
         return [
-            ConversationResponse(
-                id=str(c.id),
-                title=c.title,
-                updated_at=c.updated_at.isoformat()
-            ) for c in conversations
+            ConversationResponse.model_construct(id=str(c.id), title=c.title, updated_at=c.updated_at)
+            for c in conversations
         ]
     except Exception as e:
         logger.error(f"Error listing conversations: {e}", exc_info=True)
@@ -151,19 +173,18 @@ async def list_conversations(current_user: User = Depends(get_current_user)):
 @router.get("/conversations/{conv_id}", response_model=List[MessageResponse])
 async def get_conversation_history(
     conv_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
     current_user: User = Depends(get_current_user)
 ):
-    conversation = await Conversation.get(conv_id)
-    if not conversation or conversation.user.ref.id != current_user.id:
-        raise HTTPException(status_code=404, detail="Conversation not found")
+    conversation_id = await _owned_conversation_id(conv_id, current_user)
     
-    messages = await Message.find(Message.conversation.id == conversation.id).sort(Message.timestamp).to_list()
+    messages = await Message.find(
+        Message.conversation.id == conversation_id, projection_model=MessageListItem
+    ).sort(Message.timestamp).skip(skip).limit(limit).to_list()
     return [
-        MessageResponse(
-            role=m.role,
-            content=m.content,
-            timestamp=m.timestamp.isoformat()
-        ) for m in messages
+        MessageResponse.model_construct(role=m.role, content=m.content, timestamp=m.timestamp)
+        for m in messages
     ]
 
 @router.delete("/conversations/{conv_id}")
@@ -171,14 +192,17 @@ async def delete_conversation(
     conv_id: str,
     current_user: User = Depends(get_current_user)
 ):
-    conversation = await Conversation.get(conv_id)
-    if not conversation or conversation.user.ref.id != current_user.id:
+    oid = _parse_conversation_id(conv_id)
+
+    # The ownership check is part of the delete filter, so nothing is loaded first
+    result = await Conversation.get_pymongo_collection().delete_one(
+        {"_id": oid, "user.$id": current_user.id}
+    )
+    if not result.deleted_count:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    
-    # Delete all messages associated with this conversation
-    await Message.find(Message.conversation.id == conversation.id).delete()
-    
-    # Delete the conversation itself
-    await conversation.delete()
+    forget_conversation(oid)
+
+    # Delete all messages associated with this conversation (served by the conversation.$id index)
+    await Message.get_pymongo_collection().delete_many({"conversation.$id": oid})
     
     return {"status": "success", "message": "Conversation deleted"}
@@ -1,23 +1,15 @@
 """
 Evaluation router - proxies feedback requests to rag-qa-api.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import Optional
-from ..services.api_client import RagApiClient
+from ..services.api_client import RagApiClient, get_api_client
 import logging
 
 router = APIRouter(prefix="/evaluation", tags=["evaluation"])
 logger = logging.getLogger(__name__)
 
-_api_client: Optional[RagApiClient] = None
-
-
-def set_api_client(client: RagApiClient):
-    global _api_client
-    _api_client = client
-
-
 class FeedbackRequest(BaseModel):
     query_id: str = Field(..., description="Query identifier")
     feedback_type: str = Field(..., description="thumbs_up, thumbs_down, or correction")
@@ -27,13 +19,10 @@ class FeedbackRequest(BaseModel):
 
 
 @router.post('/feedback')
-async def submit_feedback(request: FeedbackRequest):
+async def submit_feedback(request: FeedbackRequest, client: RagApiClient = Depends(get_api_client)):
     """Submit user feedback for a query - proxies to rag-qa-api"""
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
-
     try:
-        result = await _api_client.submit_feedback(
+        result = await client.submit_feedback(
             query_id=request.query_id,
             feedback_type=request.feedback_type,
             rating=request.rating,
@@ -43,14 +32,14 @@ async def submit_feedback(request: FeedbackRequest):
         return result
     except Exception as e:
         logger.error(f"Error submitting feedback: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get('/feedback')
-async def get_feedback():
+async def get_feedback(client: RagApiClient = Depends(get_api_client)):
     """Get all user feedback - proxies to rag-qa-api"""
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
-
     try:
-        return await _api_client.get_all_feedback()
+        return await client.get_all_feedback()
     except Exception as e:
         logger.error(f"Error fetching feedback: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,61 +1,105 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Depends
 from pathlib import Path
-import tempfile
 import os
+import re
 import logging
 import httpx
-from ..services.api_client import RagApiClient, _extract_error_message
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from ..services.api_client import RagApiClient, _extract_error_message, get_api_client
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
 
 router = APIRouter(prefix="/ingest", tags=["ingestion"])
 logger = logging.getLogger(__name__)
 
-# Global API client instance
-_api_client = None
-
-def set_api_client(client: RagApiClient):
-    global _api_client
-    _api_client = client
+# Uploads larger than this are rejected before being relayed upstream
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# File types rag-qa-api can ingest
+ALLOWED_UPLOAD_EXTENSIONS = frozenset({'.txt', '.pdf', '.docx', '.md'})
+# How much of a raw multipart body may be buffered while looking for the file part's headers
+MAX_MULTIPART_PREAMBLE_BYTES = 64 * 1024
+_FILENAME_RE = re.compile(rb'content-disposition:[^\r\n]*?\bfilename="([^"\r\n]*)"', re.IGNORECASE)
 
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
     chunk_size: int = 1000,
-    chunk_overlap: int = 200
+    chunk_overlap: int = 200,
+    client: RagApiClient = Depends(get_api_client)
 ):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
-
     file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in {'.txt', '.pdf', '.docx', '.md'}:
+    if file_ext not in ALLOWED_UPLOAD_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
 
-    tmp_path = None
-    try:
-        # Save upload to local temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-
-        # Proxy the upload to rag-qa-api
-        result = await _api_client.upload_file(
-            tmp_path, 
-            file.filename, 
-            chunk_size, 
-            chunk_overlap
-        )
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
 
-        return result
+    try:
+        # Relay the spooled upload straight to rag-qa-api
+        return await client.upload_file_stream(file, chunk_size, chunk_overlap)
     except Exception as e:
         logger.error(f"Error proxying upload: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
 
 
+@router.post("/upload/stream")
+async def upload_file_stream(request: Request, client: RagApiClient = Depends(get_api_client)):
+    """
+    Relay a raw multipart/form-data upload body to rag-qa-api as it is received,
+    without spooling it here. Only the file part's headers are read, to apply the
+    same file-type check as /ingest/upload. The body must carry the same fields
+    as /ingest/upload (file, chunk_size, chunk_overlap).
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    chunks = request.stream()
+    received = 0
+
+    # Buffer just enough of the body to read the file part's filename, so the
+    # same extension check as /ingest/upload applies before anything is relayed
+    preamble = b""
+    match = None
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large")
+        preamble += chunk
+        match = _FILENAME_RE.search(preamble)
+        if match or len(preamble) > MAX_MULTIPART_PREAMBLE_BYTES:
+            break
+    if not match:
+        raise HTTPException(status_code=400, detail="Missing file part")
+
+    file_ext = Path(match.group(1).decode("utf-8", "replace")).suffix.lower()
+    if file_ext not in ALLOWED_UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
+
+    async def capped_body():
+        nonlocal received
+        yield preamble
+        async for chunk in chunks:
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="File too large")
+            yield chunk
+
+    try:
+        return await client.upload_raw_stream(capped_body(), content_type)
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        error_msg = _extract_error_message(e)
+        logger.error(f"Error proxying streamed upload: {error_msg}")
+        raise HTTPException(status_code=e.response.status_code, detail=error_msg)
+    except Exception as e:
+        logger.error(f"Error proxying streamed upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 class EtlIngestRequest(BaseModel):
     source_type: str
@@ -68,13 +112,10 @@ class EtlIngestRequest(BaseModel):
 
 
 @router.post('/etl/ingest')
-async def etl_ingest(request: EtlIngestRequest):
+async def etl_ingest(request: EtlIngestRequest, client: RagApiClient = Depends(get_api_client)):
     """Proxy endpoint: accepts generic ETL ingestion requests from the frontend and forwards them to rag-qa-api."""
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
-
     try:
-        result = await _api_client.etl_ingest(
+        result = await client.etl_ingest(
             source_type=request.source_type,
             source_params=request.source_params,
             chunk_size=request.chunk_size,
@@ -100,12 +141,9 @@ class EtlSubmitRequest(BaseModel):
 
 
 @router.post('/etl/submit')
-async def etl_submit(request: EtlSubmitRequest):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
-
+async def etl_submit(request: EtlSubmitRequest, client: RagApiClient = Depends(get_api_client)):
     try:
-        result = await _api_client.etl_submit(
+        result = await client.etl_submit(
             source_type=request.source_type,
             source_params=request.source_params,
             chunk_size=request.chunk_size,
@@ -121,11 +159,9 @@ async def etl_submit(request: EtlSubmitRequest):
 
 
 @router.get('/etl/status/{job_id}')
-async def etl_status(job_id: str):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
+async def etl_status(job_id: str, fresh: bool = False, client: RagApiClient = Depends(get_api_client)):
     try:
-        result = await _api_client.etl_status(job_id)
+        result = await client.etl_status(job_id, fresh=fresh)
         return result
     except httpx.HTTPStatusError as e:
         # Propagate the status code from upstream
@@ -138,12 +174,25 @@ async def etl_status(job_id: str):
         raise HTTPException(status_code=500, detail=error_msg)
 
 
+class BatchStatusRequest(BaseModel):
+    job_ids: List[str] = Field(..., max_length=500)
+
+
+@router.post('/etl/status/batch')
+async def etl_status_batch(request: BatchStatusRequest, fresh: bool = False, client: RagApiClient = Depends(get_api_client)):
+    """Statuses for many jobs in one round trip, keyed by job id"""
+    try:
+        return await client.etl_status_batch(request.job_ids, fresh=fresh)
+    except Exception as e:
+        error_msg = _extract_error_message(e)
+        logger.error(f"Error proxying ETL batch status: {error_msg}")
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
 @router.get('/etl/jobs')
-async def etl_jobs(limit: int = 50, skip: int = 0, search: Optional[str] = None):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
+async def etl_jobs(limit: int = 50, skip: int = 0, search: Optional[str] = None, fresh: bool = False, client: RagApiClient = Depends(get_api_client)):
     try:
-        result = await _api_client.etl_list_jobs(limit=limit, skip=skip, search=search)
+        result = await client.etl_list_jobs(limit=limit, skip=skip, search=search, fresh=fresh)
         return result
     except httpx.HTTPStatusError as e:
         error_msg = _extract_error_message(e)
@@ -156,11 +205,9 @@ async def etl_jobs(limit: int = 50, skip: int = 0, search: Optional[str] = None)
 
 
 @router.get('/etl/jobs/{job_id}/logs')
-async def etl_job_logs(job_id: str):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
+async def etl_job_logs(job_id: str, client: RagApiClient = Depends(get_api_client)):
     try:
-        result = await _api_client.etl_job_logs(job_id)
+        result = await client.etl_job_logs(job_id)
         return result
     except httpx.HTTPStatusError as e:
         error_msg = _extract_error_message(e)
@@ -174,29 +221,27 @@ async def etl_job_logs(job_id: str):
 
 # Alias routes for backwards compatibility (without /etl prefix)
 @router.post('/submit')
-async def ingest_submit(request: EtlSubmitRequest):
+async def ingest_submit(request: EtlSubmitRequest, client: RagApiClient = Depends(get_api_client)):
     """Alias for /etl/submit - submit an async ingestion job"""
-    return await etl_submit(request)
+    return await etl_submit(request, client)
 
 
 @router.get('/status/{job_id}')
-async def ingest_status(job_id: str):
+async def ingest_status(job_id: str, fresh: bool = False, client: RagApiClient = Depends(get_api_client)):
     """Alias for /etl/status/{job_id}"""
-    return await etl_status(job_id)
+    return await etl_status(job_id, fresh, client)
 
 
 @router.get('/jobs')
-async def ingest_jobs(limit: int = 50, skip: int = 0, search: Optional[str] = None):
+async def ingest_jobs(limit: int = 50, skip: int = 0, search: Optional[str] = None, fresh: bool = False, client: RagApiClient = Depends(get_api_client)):
     """Alias for /etl/jobs"""
-    return await etl_jobs(limit, skip, search)
+    return await etl_jobs(limit, skip, search, fresh, client)
 
 
 @router.delete('/jobs/{job_id}')
-async def delete_ingest_job(job_id: str):
-    if not _api_client:
-        raise HTTPException(status_code=503, detail="API client not initialized")
+async def delete_ingest_job(job_id: str, client: RagApiClient = Depends(get_api_client)):
     try:
-        return await _api_client.delete_ingest_job(job_id)
+        return await client.delete_ingest_job(job_id)
     except Exception as e:
         logger.error(f"Error deleting ingest job proxy: {e}")
         raise HTTPException(status_code=500, detail=str(e))
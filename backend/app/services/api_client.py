@@ -1,21 +1,46 @@
+import asyncio
 import httpx
 import logging
+import orjson
 import os
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, UploadFile
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for the shared rag-qa-api client
+RAG_API_MAX_CONNECTIONS = int(os.getenv("RAG_API_MAX_CONNECTIONS", "200"))
+RAG_API_MAX_KEEPALIVE = int(os.getenv("RAG_API_MAX_KEEPALIVE", "100"))
+# How long a job status snapshot is reused for repeated polls
+ETL_STATUS_CACHE_TTL = int(os.getenv("ETL_STATUS_CACHE_TTL_MS", "1500")) / 1000
+# Job states that never change again, and how many such jobs to remember
+TERMINAL_JOB_STATUSES = frozenset({"completed", "failed", "cancelled"})
+TERMINAL_JOBS_MAX = 10_000
+# Upper bound on concurrent upstream requests for one batch status call
+ETL_STATUS_BATCH_CONCURRENCY = 32
+# Ask rag-qa-api for compressed responses; brotli only when its decoder is installed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "br, gzip"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+# Hot-path request bodies are encoded with orjson and sent as raw content
+_JSON_HEADERS = {"content-type": "application/json"}
+
 
 def _extract_error_message(e: Exception) -> str:
     """Extract a meaningful error message from an exception"""
     if isinstance(e, httpx.HTTPStatusError):
-        # Try to get detail from response body
-        try:
-            body = e.response.json()
-            if 'detail' in body and body['detail']:
+        # Only JSON error bodies can carry a detail field
+        if e.response.headers.get("content-type", "").startswith("application/json"):
+            try:
+                body = orjson.loads(e.response.content)
+            except orjson.JSONDecodeError:
+                body = None
+            if isinstance(body, dict) and body.get('detail'):
                 return f"API error ({e.response.status_code}): {body['detail']}"
-        except:
-            pass
         return f"API error ({e.response.status_code}): {e.response.text[:200] if e.response.text else 'No response body'}"
     elif isinstance(e, httpx.ConnectError):
         return f"Connection failed: Could not connect to RAG API"
@@ -24,51 +49,114 @@ def _extract_error_message(e: Exception) -> str:
     return str(e) or f"Unknown error: {type(e).__name__}"
 
 
+def get_api_client(request: Request) -> "RagApiClient":
+    """FastAPI dependency returning the shared client stored on app.state at startup"""
+    client = getattr(request.app.state, "api_client", None)
+    if client is None:
+        raise HTTPException(status_code=503, detail="API client not initialized")
+    return client
+
+
 class RagApiClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
+        self._client = self._build_client()
+        # Job listings are polled by every open admin/ingestion view; identical
+        # requests share one upstream call and its result for a couple of seconds
+        self._jobs_cache: TTLCache = TTLCache(maxsize=128, ttl=2.0)
+        self._jobs_inflight: Dict[Tuple, "asyncio.Future[Dict[str, Any]]"] = {}
+        # Per-job status snapshots; entries are stamped when the fetch completes
+        self._status_cache: TTLCache = TTLCache(maxsize=1024, ttl=ETL_STATUS_CACHE_TTL)
+        # Finished jobs keep being polled by open tabs; answer those locally (LRU)
+        self._terminal_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._status_inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        # One pooled client for every proxy call, so requests reuse keep-alive
+        # connections (multiplexed over HTTP/2 where the server supports it)
+        # A custom transport owns the pool settings; retries only cover failed connects
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=1,
+            limits=httpx.Limits(
+                max_connections=RAG_API_MAX_CONNECTIONS,
+                max_keepalive_connections=RAG_API_MAX_KEEPALIVE,
+                keepalive_expiry=30.0
+            )
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            headers={"accept-encoding": _ACCEPT_ENCODING},
+            timeout=60.0
+        )
+
+    async def startup(self):
+        """Ensure the pooled HTTP client is open; call on application startup."""
+        if self._client.is_closed:
+            self._client = self._build_client()
+
+    async def aclose(self):
+        """Close the pooled HTTP client; call on application shutdown."""
+        await self._client.aclose()
+
+    async def probe(self, path: str = "/health") -> httpx.Response:
+        """GET a rag-qa-api health endpoint with a short timeout; the caller inspects the status"""
+        return await self._client.get(path, timeout=5.0)
 
     async def search(self, query: str, limit: int = 5, score_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
         """Call the rag-qa-api /search endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/search",
-                    json={
-                        "query": query,
-                        "limit": limit,
-                        "score_threshold": score_threshold
-                    },
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("results", [])
-            except Exception as e:
-                logger.error(f"Error calling search API: {e}")
-                return []
-
-    async def upload_file(self, file_path: str, filename: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Dict[str, Any]:
-        """Call the rag-qa-api /ingest/upload endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                with open(file_path, "rb") as f:
-                    files = {"file": (filename, f)}
-                    data = {
-                        "chunk_size": str(chunk_size),
-                        "chunk_overlap": str(chunk_overlap)
-                    }
-                    response = await client.post(
-                        f"{self.base_url}/ingest/upload",
-                        files=files,
-                        data=data,
-                        timeout=300.0  # 5 minutes for large files / first-time model loading
-                    )
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling upload API: {e}")
-                raise
+        try:
+            response = await self._client.post(
+                "/search",
+                content=orjson.dumps({
+                    "query": query,
+                    "limit": limit,
+                    "score_threshold": score_threshold
+                }),
+                headers=_JSON_HEADERS,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("results", [])
+        except Exception as e:
+            logger.error(f"Error calling search API: {e}")
+            return []
+
+    async def upload_file_stream(self, file: UploadFile, chunk_size: int = 1000, chunk_overlap: int = 200) -> Dict[str, Any]:
+        """Relay an incoming upload to rag-qa-api /ingest/upload without a temp-file copy"""
+        try:
+            await file.seek(0)
+            response = await self._client.post(
+                "/ingest/upload",
+                files={"file": (file.filename, file.file, file.content_type)},
+                data={
+                    "chunk_size": str(chunk_size),
+                    "chunk_overlap": str(chunk_overlap)
+                },
+                timeout=300.0  # 5 minutes for large files / first-time model loading
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling upload API: {e}")
+            raise
+
+    async def upload_raw_stream(self, body: AsyncIterator[bytes], content_type: str) -> Dict[str, Any]:
+        """Forward an already-encoded multipart body to rag-qa-api /ingest/upload as it arrives"""
+        try:
+            response = await self._client.post(
+                "/ingest/upload",
+                content=body,
+                headers={"content-type": content_type},
+                timeout=300.0
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling upload API: {e}")
+            raise
 
     async def etl_ingest(self, source_type: str, source_params: Optional[Dict[str, Any]] = None, chunk_size: int = 1000, chunk_overlap: int = 200, batch_size: int = 32, store_in_qdrant: bool = True, name: Optional[str] = None) -> Dict[str, Any]:
         """Call the rag-qa-api generic ingestion endpoint (/ingest/run)"""
@@ -83,14 +171,13 @@ class RagApiClient:
         if name:
             payload["name"] = name
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(f"{self.base_url}/ingest/run", json=payload, timeout=300.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling etl_ingest API: {e}")
-                raise
+        try:
+            response = await self._client.post("/ingest/run", json=payload, timeout=300.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling etl_ingest API: {e}")
+            raise
 
     async def etl_submit(self, source_type: str, source_params: Optional[Dict[str, Any]] = None, chunk_size: int = 1000, chunk_overlap: int = 200, batch_size: int = 32, store_in_qdrant: bool = True, name: Optional[str] = None) -> Dict[str, Any]:
         """Submit an async ETL job to rag-qa-api (/ingest/submit)"""
@@ -105,39 +192,90 @@ class RagApiClient:
         if name:
             payload["name"] = name
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(f"{self.base_url}/ingest/submit", json=payload, timeout=30.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling etl_submit API: {e}")
-                raise
-
-    async def etl_status(self, job_id: str) -> Dict[str, Any]:
-        """Get job status from rag-qa-api (/ingest/status/{job_id})"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.base_url}/ingest/status/{job_id}", timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling etl_status API: {e}")
-                raise
-
-    async def etl_list_jobs(self, limit: int = 50, skip: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
-        """List ingest jobs from rag-qa-api (/ingest/jobs)"""
-        async with httpx.AsyncClient() as client:
-            try:
-                params = {"limit": limit, "skip": skip}
-                if search:
-                    params["search"] = search
-                response = await client.get(f"{self.base_url}/ingest/jobs", params=params, timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling etl_list_jobs API: {e}")
-                raise
+        try:
+            response = await self._client.post("/ingest/submit", json=payload, timeout=30.0)
+            response.raise_for_status()
+            self._jobs_cache.clear()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling etl_submit API: {e}")
+            raise
+
+    async def etl_status(self, job_id: str, fresh: bool = False) -> Dict[str, Any]:
+        """Get job status from rag-qa-api (/ingest/status/{job_id}); ``fresh`` bypasses the poll cache"""
+        terminal = self._terminal_jobs.get(job_id)
+        if terminal is not None:
+            self._terminal_jobs.move_to_end(job_id)
+            return terminal
+        if not fresh and job_id in self._status_cache:
+            return self._status_cache[job_id]
+
+        # Concurrent polls for the same job share one in-flight upstream request
+        task = self._status_inflight.get(job_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_status(job_id))
+            self._status_inflight[job_id] = task
+            task.add_done_callback(lambda _: self._status_inflight.pop(job_id, None))
+        result = await asyncio.shield(task)
+        if result.get("status") in TERMINAL_JOB_STATUSES:
+            self._terminal_jobs[job_id] = result
+            if len(self._terminal_jobs) > TERMINAL_JOBS_MAX:
+                self._terminal_jobs.popitem(last=False)
+        else:
+            self._status_cache[job_id] = result
+        return result
+
+    async def etl_status_batch(self, job_ids: List[str], fresh: bool = False) -> Dict[str, Any]:
+        """Fetch several job statuses concurrently; failed lookups map to {"error": ...}"""
+        semaphore = asyncio.Semaphore(ETL_STATUS_BATCH_CONCURRENCY)
+
+        async def one(job_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.etl_status(job_id, fresh=fresh)
+
+        unique_ids = list(dict.fromkeys(job_ids))
+        results = await asyncio.gather(*(one(job_id) for job_id in unique_ids), return_exceptions=True)
+        return {
+            job_id: {"error": _extract_error_message(result)} if isinstance(result, Exception) else result
+            for job_id, result in zip(unique_ids, results)
+        }
+
+    async def _fetch_status(self, job_id: str) -> Dict[str, Any]:
+        try:
+            response = await self._client.get(f"/ingest/status/{job_id}", timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling etl_status API: {e}")
+            raise
+
+    async def etl_list_jobs(self, limit: int = 50, skip: int = 0, search: Optional[str] = None, fresh: bool = False) -> Dict[str, Any]:
+        """List ingest jobs from rag-qa-api (/ingest/jobs), coalescing identical concurrent calls"""
+        key = (limit, skip, search)
+        if not fresh and key in self._jobs_cache:
+            return self._jobs_cache[key]
+
+        task = self._jobs_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_jobs(limit, skip, search))
+            self._jobs_inflight[key] = task
+            task.add_done_callback(lambda _: self._jobs_inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the shared request
+        result = await asyncio.shield(task)
+        self._jobs_cache[key] = result
+        return result
+
+    async def _fetch_jobs(self, limit: int, skip: int, search: Optional[str]) -> Dict[str, Any]:
+        try:
+            params = {"limit": limit, "skip": skip}
+            if search:
+                params["search"] = search
+            response = await self._client.get("/ingest/jobs", params=params, timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling etl_list_jobs API: {e}")
+            raise
 
     async def list_ingest_jobs(self, limit: int = 50, skip: int = 0, search: Optional[str] = None) -> List[Dict[str, Any]]:
         """Alias for etl_list_jobs - returns list of jobs for admin dashboard"""
@@ -146,24 +284,55 @@ class RagApiClient:
 
     async def delete_ingest_job(self, job_id: str) -> Dict[str, Any]:
         """Call the rag-qa-api DELETE /ingest/jobs/{job_id} endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.delete(f"{self.base_url}/ingest/jobs/{job_id}", timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling delete_ingest_job API: {e}")
-                raise
+        try:
+            response = await self._client.delete(f"/ingest/jobs/{job_id}", timeout=60.0)
+            response.raise_for_status()
+            self._jobs_cache.clear()
+            self._status_cache.pop(job_id, None)
+            self._terminal_jobs.pop(job_id, None)
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling delete_ingest_job API: {e}")
+            raise
 
     async def etl_job_logs(self, job_id: str) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.base_url}/ingest/jobs/{job_id}/logs", timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling etl_job_logs API: {e}")
-                raise
+        try:
+            response = await self._client.get(f"/ingest/jobs/{job_id}/logs", timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling etl_job_logs API: {e}")
+            raise
+
+    async def create_integration(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a saved integration in rag-qa-api (POST /integrations/)"""
+        try:
+            response = await self._client.post("/integrations/", json=payload, timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling create_integration API: {e}")
+            raise
+
+    async def list_integrations(self) -> Any:
+        """List saved integrations from rag-qa-api (GET /integrations/)"""
+        try:
+            response = await self._client.get("/integrations/", timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling list_integrations API: {e}")
+            raise
+
+    async def delete_integration(self, integration_id: str) -> Dict[str, Any]:
+        """Delete a saved integration in rag-qa-api (DELETE /integrations/{id})"""
+        try:
+            response = await self._client.delete(f"/integrations/{integration_id}", timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling delete_integration API: {e}")
+            raise
 
     async def chat_query(
         self,
@@ -176,27 +345,27 @@ class RagApiClient:
         return_sources: bool = True
     ) -> Dict[str, Any]:
         """Call the rag-qa-api /chat/query endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                logger.info(f"calling chat/query client call")
-                response = await client.post(
-                    f"{self.base_url}/chat/query",
-                    json={
-                        "question": question,
-                        "top_k": top_k,
-                        "score_threshold": score_threshold,
-                        "system_instruction": system_instruction,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature,
-                        "return_sources": return_sources
-                    },
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling chat query API: {e}")
-                raise
+        try:
+            logger.info(f"calling chat/query client call")
+            response = await self._client.post(
+                "/chat/query",
+                content=orjson.dumps({
+                    "question": question,
+                    "top_k": top_k,
+                    "score_threshold": score_threshold,
+                    "system_instruction": system_instruction,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "return_sources": return_sources
+                }),
+                headers=_JSON_HEADERS,
+                timeout=60.0
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling chat query API: {e}")
+            raise
     async def chat_with_history(
         self,
         messages: List[Dict[str, str]],
@@ -206,26 +375,26 @@ class RagApiClient:
         system_instruction: Optional[str] = None
     ) -> Dict[str, Any]:
         """Call the rag-qa-api /chat/ endpoint with history"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/chat/",
-                    json={
-                        "messages": messages,
-                        "top_k": top_k,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature,
-                        "system_instruction": system_instruction
-                    },
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error calling chat history API: {e}")
-                raise
+        try:
+            response = await self._client.post(
+                "/chat/",
+                content=orjson.dumps({
+                    "messages": messages,
+                    "top_k": top_k,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature,
+                    "system_instruction": system_instruction
+                }),
+                headers=_JSON_HEADERS,
+                timeout=60.0
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error calling chat history API: {e}")
+            raise
 
-    async def chat_query_stream(
+    async def chat_query_stream_raw(
         self,
         question: str,
         top_k: int = 5,
@@ -233,30 +402,29 @@ class RagApiClient:
         system_instruction: Optional[str] = None,
         max_tokens: int = 1000,
         temperature: float = 0.7
-    ):
-        """Stream from rag-qa-api /chat/query/stream endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                async with client.stream(
-                    "POST",
-                    f"{self.base_url}/chat/query/stream",
-                    json={
-                        "question": question,
-                        "top_k": top_k,
-                        "score_threshold": score_threshold,
-                        "system_instruction": system_instruction,
-                        "max_tokens": max_tokens,
-                        "temperature": temperature
-                    },
-                    timeout=120.0
-                ) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line:
-                            yield line
-            except Exception as e:
-                logger.error(f"Error streaming from chat query API: {e}")
-                raise
+    ) -> AsyncIterator[bytes]:
+        """Stream /chat/query/stream as raw byte chunks, forwarded as soon as they arrive"""
+        try:
+            async with self._client.stream(
+                "POST",
+                "/chat/query/stream",
+                content=orjson.dumps({
+                    "question": question,
+                    "top_k": top_k,
+                    "score_threshold": score_threshold,
+                    "system_instruction": system_instruction,
+                    "max_tokens": max_tokens,
+                    "temperature": temperature
+                }),
+                headers=_JSON_HEADERS,
+                timeout=120.0
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except Exception as e:
+            logger.error(f"Error streaming from chat query API: {e}")
+            raise
 
     async def submit_feedback(
         self,
@@ -278,26 +446,24 @@ class RagApiClient:
         if correction:
             payload["correction"] = correction
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/evaluation/feedback",
-                    json=payload,
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error submitting feedback: {e}")
-                raise
+        try:
+            response = await self._client.post(
+                "/evaluation/feedback",
+                json=payload,
+                timeout=60.0
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error submitting feedback: {e}")
+            raise
 
     async def get_all_feedback(self) -> List[Dict[str, Any]]:
         """Fetch all feedback from rag-qa-api /evaluation/feedback endpoint"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{self.base_url}/evaluation/feedback", timeout=60.0)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"Error fetching feedback: {e}")
-                raise
+        try:
+            response = await self._client.get("/evaluation/feedback", timeout=60.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Error fetching feedback: {e}")
+            raise
@@ -1,50 +1,76 @@
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Any, Union
-from jose import jwt
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict
+import jwt
 from dotenv import load_dotenv
+from cachetools import TTLCache
 
 load_dotenv()
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-me-in-production")
 ALGORITHM = "HS256"
+# Every token we issue carries these; reject any that don't
+_JWT_OPTIONS = {"require": ["exp", "sub"]}
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 # 24 hours
+# Verified tokens are trusted for this many seconds before re-checking signature and user
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "30"))
+# User documents are reused for this long; mutations must call invalidate_user().
+# invalidate_user() only reaches the current process, so with several workers the
+# cache is off by default (a role change or deactivation must apply everywhere).
+_MULTI_WORKER = int(os.getenv("WEB_CONCURRENCY", "1")) > 1
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "0" if _MULTI_WORKER else "60"))
 
 import bcrypt
 
 # Password hashing configuration
+# bcrypt cost factor; each +1 doubles hashing time (12 is roughly 250 ms on a modern core)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+def _password_bytes(password: str) -> bytes:
+    # bcrypt requires bytes and only looks at the first 72
+    return password.encode('utf-8')[:72]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        # bcrypt requires bytes
-        password_bytes = plain_password.encode('utf-8')[:72]
-        hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
-    except Exception as e:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode('utf-8'))
+    except Exception:
         return False
 
 def get_password_hash(password: str) -> str:
-    # bcrypt requires bytes, max 72 bytes
-    password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_password_bytes(password), salt).decode('utf-8')
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash on a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.to_thread(get_password_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _token_key(token: str) -> str:
+    # Caches are keyed by a digest so raw bearer tokens are never held in memory
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def decode_access_token(token: str) -> Optional[dict]:
+    # jwt.decode verifies the signature and exp; repeat requests are served by _token_cache
     try:
-        decoded_token = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return decoded_token if decoded_token["exp"] >= datetime.utcnow().timestamp() else None
-    except:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options=_JWT_OPTIONS)
+    except jwt.PyJWTError:
         return None
 
 from fastapi import Depends, HTTPException, status
@@ -53,7 +79,58 @@ from ..models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# lowercased email -> User; misses are not cached
+_user_by_email: TTLCache = TTLCache(maxsize=5000, ttl=max(USER_CACHE_TTL, 1))
+
+async def get_user_by_email(email: str) -> Optional[User]:
+    """
+    Look up a user by email through a short-lived cache.
+    Reads may be up to USER_CACHE_TTL seconds stale unless invalidate_user() is called.
+    """
+    email = email.lower()
+    user = _user_by_email.get(email)
+    if user is None:
+        user = await User.find_one(User.email == email)
+        if user is not None and USER_CACHE_TTL > 0:
+            _user_by_email[email] = user
+    return user
+
+def invalidate_user(email: str) -> None:
+    """Drop a user from the cache after changing or deleting their document."""
+    _user_by_email.pop(email.lower(), None)
+
+# sha256(token) -> (exp, email); only successful validations are ever stored
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL)
+_token_locks: Dict[str, asyncio.Lock] = {}
+
+async def _cached_user(key: str) -> Optional[User]:
+    entry = _token_cache.get(key)
+    if entry and entry[0] > time.time():
+        # Resolve through the user cache so invalidate_user() takes effect immediately
+        return await get_user_by_email(entry[1])
+    return None
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    key = _token_key(token)
+    user = await _cached_user(key)
+    if user is not None:
+        return user
+
+    # One validation per token at a time, so a burst of cold requests shares the result
+    lock = _token_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            user = await _cached_user(key)
+            if user is not None:
+                return user
+            exp, user = await _authenticate(token)
+            _token_cache[key] = (exp, user.email)
+            return user
+    finally:
+        if not lock.locked():
+            _token_locks.pop(key, None)
+
+async def _authenticate(token: str):
     import logging
     logger = logging.getLogger(__name__)
     credentials_exception = HTTPException(
@@ -61,18 +138,16 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        # logger.info(f"Validating token: {token[:20]}..." if token else "No token")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            logger.warning("Token payload missing 'sub' field")
-            raise credentials_exception
-    except Exception as e:
-        logger.error(f"JWT validation error: {e}")
+    payload = decode_access_token(token)
+    if payload is None:
+        logger.warning("JWT validation failed")
+        raise credentials_exception
+    email: str = payload.get("sub")
+    if email is None:
+        logger.warning("Token payload missing 'sub' field")
         raise credentials_exception
-    
-    user = await User.find_one(User.email == email)
+
+    user = await get_user_by_email(email)
     if user is None:
         raise credentials_exception
-    return user
+    return payload.get("exp", 0), user
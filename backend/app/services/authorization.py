@@ -14,23 +14,37 @@ async def require_admin(current_user: User = Depends(get_current_user)) -> User:
         )
     return current_user
 
-def require_role(required_role: str):
+def require_roles(*roles: str):
     """
-    Dependency factory that requires the user to have a specific role.
-    Returns an async dependency function that checks the user's role.
+    Dependency factory that requires the user to hold one of the given roles.
+    Admins always pass. The allowed set is built once, when the dependency is created.
 
     Usage:
-        @router.get("/admin-only", dependencies=[Depends(require_role("admin"))])
+        require_editor = require_roles("editor", "admin")
+        @router.get("/edit", dependencies=[Depends(require_editor)])
     """
+    allowed = frozenset(roles)
+    detail = f"Role {' or '.join(repr(r) for r in roles)} required"
+
     async def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role != required_role and not current_user.is_admin:
+        if current_user.role not in allowed and not current_user.is_admin:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role '{required_role}' required"
+                detail=detail
             )
         return current_user
     return role_checker
 
+def require_role(required_role: str):
+    """
+    Dependency factory that requires the user to have a specific role.
+    Build it once at module level so FastAPI sees the same dependency on every route.
+
+    Usage:
+        @router.get("/admin-only", dependencies=[Depends(require_role("admin"))])
+    """
+    return require_roles(required_role)
+
 async def require_superadmin(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency that requires the user to be a superadmin.
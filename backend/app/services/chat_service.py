@@ -1,10 +1,101 @@
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, AsyncIterator, Coroutine, Set
+import asyncio
 import logging
-import json
+from datetime import datetime
+import re
+import orjson
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from pydantic import BaseModel
+from ..models import Conversation, Message, utc_now
 from .api_client import RagApiClient
 
 logger = logging.getLogger(__name__)
 
+class HistoryMessage(BaseModel):
+    """The only message fields sent upstream as chat history"""
+    role: str
+    content: str
+
+# conversation id -> owner id, so follow-up turns skip the ownership query.
+# Anything that deletes conversations must call forget_conversation()
+_conversation_owners: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+def forget_conversation(conversation_id: PydanticObjectId) -> None:
+    """Drop a conversation from the ownership cache after deleting it."""
+    _conversation_owners.pop(conversation_id, None)
+
+# rag-qa-api sends {"type": "token", "data": {"content": "..."}}; the content is
+# captured still JSON-escaped, so the answer is decoded once after the stream ends
+_DATA_PREFIX = b"data: "
+_TOKEN_EVENT = re.compile(rb'"type":\s*"token"')
+_TOKEN_CONTENT = re.compile(rb'"content":\s*"((?:[^"\\]|\\.)*)"')
+
+def _token_content(line: bytes) -> bytes:
+    """JSON-escaped answer text carried by one SSE line, or b"" for non-token events"""
+    # Cheapest checks first: SSE data prefix, then a plain substring, then the regexes
+    if not line.startswith(_DATA_PREFIX) or b'"token"' not in line or not _TOKEN_EVENT.search(line):
+        return b""
+    match = _TOKEN_CONTENT.search(line)
+    return match.group(1) if match else b""
+
+def _decode_answer(parts: List[bytes]) -> str:
+    """Join escaped token fragments and decode them as one JSON string"""
+    try:
+        return orjson.loads(b'"' + b"".join(parts) + b'"')
+    except orjson.JSONDecodeError:
+        logger.warning("Could not decode streamed answer; storing it unescaped")
+        return b"".join(parts).decode("utf-8", errors="replace")
+
+async def _whole_lines(chunks: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    """Re-cut an upstream byte stream so every piece ends on a line boundary
+
+    Transport chunks (especially after gzip/br decoding) can end mid-line; clients
+    parse each read as whole SSE lines, so a partial line is held back until its
+    newline arrives. Whatever is left when the stream ends is flushed as-is.
+    """
+    pending = b""
+    async for chunk in chunks:
+        buffered = pending + chunk
+        cut = buffered.rfind(b"\n") + 1
+        if cut:
+            pending = buffered[cut:]
+            yield buffered[:cut]
+        else:
+            pending = buffered
+    if pending:
+        yield pending
+
+# Writes that outlive the response; held here so they aren't garbage-collected mid-flight
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+def _run_in_background(coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def drain_background_tasks() -> None:
+    """Wait for pending background writes; called on shutdown."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+async def _persist_reply(conversation_oid: PydanticObjectId, answer_parts: List[bytes], replied_at: datetime) -> None:
+    """Store a streamed assistant reply; failures are logged since no caller is left to see them"""
+    try:
+        full_answer = _decode_answer(answer_parts)
+        if not full_answer:
+            return
+        assistant_msg = Message(
+            conversation=conversation_oid,
+            role="assistant",
+            content=full_answer,
+            timestamp=replied_at
+        )
+        await asyncio.gather(assistant_msg.insert(), Conversation.record_messages(conversation_oid, at=replied_at))
+    except Exception as e:
+        logger.error(f"Error saving streamed reply for conversation {conversation_oid}: {e}")
+
 class ChatService:
     def __init__(
         self,
@@ -13,6 +104,27 @@ class ChatService:
     ):
         self.api_client = api_client
 
+    async def _resolve_conversation(self, conversation_id: Optional[str], user: Any, question: str, now: datetime) -> PydanticObjectId:
+        """Id of the user's existing conversation, or of a new one titled after the question"""
+        if conversation_id:
+            # Ownership is checked in the filter; the document itself is never loaded
+            try:
+                oid = PydanticObjectId(conversation_id)
+            except (InvalidId, TypeError):
+                raise ValueError("Conversation not found")
+            if _conversation_owners.get(oid) != user.id:
+                if not await Conversation.owned_by(oid, user.id):
+                    raise ValueError("Conversation not found")
+                _conversation_owners[oid] = user.id
+            return oid
+
+        # Use first few words of question as title
+        title = (question[:50] + '...') if len(question) > 50 else question
+        conversation = Conversation(title=title, user=user, user_email_cache=user.email, created_at=now, updated_at=now)
+        await conversation.insert()
+        _conversation_owners[conversation.id] = user.id
+        return conversation.id
+
     async def query(
         self,
         question: str,
@@ -25,71 +137,71 @@ class ChatService:
         score_threshold: Optional[float] = None
     ) -> Dict[str, Any]:
         """Process chat query by delegating to rag-qa-api and saving history"""
-        from ..models import Conversation, Message
-        from datetime import datetime
-        
         try:
             # 1. Handle Conversation
-            if conversation_id:
-                conversation = await Conversation.get(conversation_id)
-                if not conversation or conversation.user.ref.id != user.id:
-                    raise ValueError("Conversation not found")
-                conversation.updated_at = datetime.utcnow()
-                await conversation.save()
-            else:
-                # Use first few words of question as title
-                title = (question[:50] + '...') if len(question) > 50 else question
-                conversation = Conversation(title=title, user=user)
-                await conversation.insert()
-            
-            # 2. Save User Message
+            # One clock read for the conversation and the user message of this turn
+            now = utc_now()
+            conversation_oid = await self._resolve_conversation(conversation_id, user, question, now)
+
+            # 2. Build User Message; it is written together with the reply below,
+            # or on its own if rag-qa-api fails
             user_msg = Message(
-                conversation=conversation,
+                conversation=conversation_oid,
                 role="user",
-                content=question
+                content=question,
+                timestamp=now
             )
-            await user_msg.insert()
 
-            # 3. Fetch History for Context
-            history_messages = []
-            if conversation:
-                # Get last 10 messages for context
+            # 3. Fetch History for Context (new conversations have none)
+            past_msgs = []
+            if conversation_id:
+                # Last 10 messages, newest first
                 past_msgs = await Message.find(
-                    Message.conversation.id == conversation.id
-                ).sort(-Message.timestamp).limit(11).to_list() # 11 to account for the one we just saved
-                
-                # Reverse to get chronological order and exclude the current message (it's already in the list)
-                # Actually, let's just fetch BEFORE saving the new one next time, but for now:
-                past_msgs.reverse()
-                history_messages = [
-                    {"role": m.role, "content": m.content} 
-                    for m in past_msgs if m.id != user_msg.id
-                ]
-            
+                    Message.conversation.id == conversation_oid
+                ).sort(-Message.timestamp).limit(10).project(HistoryMessage).to_list()
+
+            # Reverse to get chronological order
+            past_msgs.reverse()
+            history_messages = [
+                {"role": m.role, "content": m.content}
+                for m in past_msgs
+            ]
+
             # Add current question
             history_messages.append({"role": "user", "content": question})
 
             # 4. Call RAG API with History
-            result = await self.api_client.chat_with_history(
-                messages=history_messages,
-                top_k=top_k,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                system_instruction=system_instruction
-            )
+            try:
+                result = await self.api_client.chat_with_history(
+                    messages=history_messages,
+                    top_k=top_k,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    system_instruction=system_instruction
+                )
+            except Exception:
+                # Keep the question even though no reply came back
+                await asyncio.gather(user_msg.insert(), Conversation.record_messages(conversation_oid, at=now))
+                raise
 
-            # 4. Save Assistant Message
+            # 5. Save User and Assistant Messages in a single write
+            # The reply gets its own (later) timestamp so history order is preserved
+            replied_at = utc_now()
             assistant_msg = Message(
-                conversation=conversation,
+                conversation=conversation_oid,
                 role="assistant",
-                content=result["answer"]
+                content=result["answer"],
+                timestamp=replied_at
+            )
+            await asyncio.gather(
+                Message.insert_many([user_msg, assistant_msg]),
+                Conversation.record_messages(conversation_oid, count=2, at=replied_at)
             )
-            await assistant_msg.insert()
 
-            # 5. Return result with conversation_id
+            # 6. Return result with conversation_id
             return {
                 **result,
-                "conversation_id": str(conversation.id)
+                "conversation_id": str(conversation_oid)
             }
         except Exception as e:
             logger.error(f"Error in ChatService.query: {e}")
@@ -105,64 +217,42 @@ class ChatService:
         max_tokens: int = 1000,
         system_instruction: Optional[str] = None,
         score_threshold: Optional[float] = None
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """Process chat query with streaming response"""
-        from ..models import Conversation, Message
-        from datetime import datetime
-
         try:
             # 1. Handle Conversation
-            if conversation_id:
-                conversation = await Conversation.get(conversation_id)
-                if not conversation or conversation.user.ref.id != user.id:
-                    raise ValueError("Conversation not found")
-                conversation.updated_at = datetime.utcnow()
-                await conversation.save()
-            else:
-                title = (question[:50] + '...') if len(question) > 50 else question
-                conversation = Conversation(title=title, user=user)
-                await conversation.insert()
+            # One clock read for the conversation and the user message of this turn
+            now = utc_now()
+            conversation_oid = await self._resolve_conversation(conversation_id, user, question, now)
 
             # 2. Save User Message
             user_msg = Message(
-                conversation=conversation,
+                conversation=conversation_oid,
                 role="user",
-                content=question
+                content=question,
+                timestamp=now
             )
-            await user_msg.insert()
+            await asyncio.gather(user_msg.insert(), Conversation.record_messages(conversation_oid, at=now))
 
             # 3. Send conversation_id first
-            yield f"data: {json.dumps({'event': 'conversation_id', 'conversation_id': str(conversation.id)})}\n\n"
+            yield _DATA_PREFIX + orjson.dumps({"event": "conversation_id", "conversation_id": str(conversation_oid)}) + b"\n\n"
 
             # 4. Stream from RAG API and collect full answer
-            full_answer = ""
-            async for line in self.api_client.chat_query_stream(
+            # Upstream bytes are relayed as whole lines; tokens are picked out on the side
+            answer_parts: List[bytes] = []
+            async for block in _whole_lines(self.api_client.chat_query_stream_raw(
                 question=question,
                 top_k=top_k,
                 score_threshold=score_threshold,
                 system_instruction=system_instruction,
                 max_tokens=max_tokens,
                 temperature=temperature
-            ):
-                yield line + "\n"
-                # Parse token events to build full answer
-                if line.startswith("data: "):
-                    try:
-                        event_data = json.loads(line[6:])
-                        # rag-qa-api sends {"type": "token", "data": {"content": "..."}}
-                        if event_data.get("type") == "token":
-                            full_answer += event_data.get("data", {}).get("content", "")
-                    except json.JSONDecodeError:
-                        pass
-
-            # 5. Save Assistant Message after streaming completes
-            if full_answer:
-                assistant_msg = Message(
-                    conversation=conversation,
-                    role="assistant",
-                    content=full_answer
-                )
-                await assistant_msg.insert()
+            )):
+                yield block
+                answer_parts.extend(_token_content(line.rstrip(b"\r")) for line in block.split(b"\n"))
+
+            # 5. Save Assistant Message in the background so the stream closes right after the last token
+            _run_in_background(_persist_reply(conversation_oid, answer_parts, utc_now()))
 
         except Exception as e:
             logger.error(f"Error in ChatService.query_stream: {e}")
@@ -2,11 +2,11 @@ import asyncio
 import os
 import sys
 import bcrypt
-from urllib.parse import quote_plus
-from motor.motor_asyncio import AsyncIOMotorClient
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+from pymongo import AsyncMongoClient
 from beanie import init_beanie, Document
 from pydantic import Field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 # Minimal User model definition for the script
@@ -17,39 +17,45 @@ class User(Document):
     is_active: bool = True
     is_admin: bool = False
     role: str = "user"
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     last_login: Optional[datetime] = None
 
     class Settings:
         name = "users"
 
-def get_password_hash(password: str) -> str:
-    pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+def get_password_hash(password: str, rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))) -> str:
+    # Same cost and 72-byte limit as app.services.auth
+    pwd_bytes = password.encode('utf-8')[:72]
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed_password = bcrypt.hashpw(pwd_bytes, salt)
     return hashed_password.decode('utf-8')
 
+def escape_mongodb_url(url: str) -> str:
+    """Percent-escape the credentials of a MongoDB URL (idempotent, multi-host safe)."""
+    parts = urlsplit(url)
+    userinfo, at, hosts = parts.netloc.rpartition("@")
+    if not at:
+        return url
+    username, colon, db_password = userinfo.partition(":")
+    userinfo = quote(unquote(username), safe="")
+    if colon:
+        userinfo += ":" + quote(unquote(db_password), safe="")
+    return urlunsplit(parts._replace(netloc=f"{userinfo}@{hosts}"))
+
 async def create_or_promote_admin(email: str, password: Optional[str] = None):
     # Connect to MongoDB
     mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017/rag_chat")
     
     # Process MONGODB_URL to escape username and password if present
-    if "://" in mongodb_url and "@" in mongodb_url:
-        try:
-            scheme, rest = mongodb_url.split("://", 1)
-            userinfo, host_rest = rest.rsplit("@", 1)
-            if ":" in userinfo:
-                username, password = userinfo.split(":", 1)
-                mongodb_url = f"{scheme}://{quote_plus(username)}:{quote_plus(password)}@{host_rest}"
-            else:
-                mongodb_url = f"{scheme}://{quote_plus(userinfo)}@{host_rest}"
-        except Exception as e:
-            print(f"Warning: Failed to parse MONGODB_URL for escaping: {e}")
+    try:
+        mongodb_url = escape_mongodb_url(mongodb_url)
+    except ValueError as e:
+        print(f"Warning: Failed to parse MONGODB_URL for escaping: {e}")
 
     print(f"Connecting to MongoDB at {mongodb_url}...")
     
     try:
-        client = AsyncIOMotorClient(mongodb_url)
+        client = AsyncMongoClient(mongodb_url)
         # Try to get database name from URL if default database not set
         db_name = mongodb_url.split("/")[-1] or "rag_chat"
         await init_beanie(database=client[db_name], document_models=[User])
@@ -73,7 +79,7 @@ async def create_or_promote_admin(email: str, password: Optional[str] = None):
             print(f"Creating new superadmin {email}...")
             user = User(
                 email=email,
-                hashed_password=get_password_hash(password),
+                hashed_password=await asyncio.to_thread(get_password_hash, password),
                 full_name="Administrator",
                 is_admin=True,
                 role="superadmin"
@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+from dotenv import load_dotenv
+from beanie import init_beanie
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import User, Conversation, Message
+from app.db import escape_mongodb_url, get_client, redact_mongodb_url
+
+def _link_id(field: str) -> dict:
+    return {"$getField": {"field": {"$literal": "$id"}, "input": f"${field}"}}
+
+async def backfill():
+    """Populate Conversation.message_count and user_email_cache for existing data."""
+    load_dotenv()
+
+    mongodb_url = escape_mongodb_url(os.getenv("MONGODB_URL", "mongodb://mongodb:27017/rag_chat"))
+    print(f"Connecting to {redact_mongodb_url(mongodb_url)}...")
+
+    client = get_client(mongodb_url)
+    await init_beanie(
+        database=client.get_default_database(),
+        document_models=[User, Conversation, Message]
+    )
+    conversations = Conversation.get_collection_name()
+
+    print("Backfilling message counts...")
+    await Conversation.get_pymongo_collection().update_many(
+        {"message_count": {"$exists": False}}, {"$set": {"message_count": 0}}
+    )
+    await (await Message.get_pymongo_collection().aggregate([
+        {"$group": {"_id": _link_id("conversation"), "message_count": {"$sum": 1}}},
+        {"$merge": {"into": conversations, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ])).to_list()
+
+    print("Backfilling owner emails...")
+    await (await Conversation.get_pymongo_collection().aggregate([
+        {"$project": {"user_id": _link_id("user")}},
+        {"$lookup": {
+            "from": User.get_collection_name(),
+            "localField": "user_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"email": 1}}],
+            "as": "owner"
+        }},
+        {"$unwind": "$owner"},
+        {"$project": {"user_email_cache": "$owner.email"}},
+        {"$merge": {"into": conversations, "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ])).to_list()
+
+    print("Backfill complete.")
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
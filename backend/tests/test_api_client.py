@@ -1,83 +1,130 @@
-import sys
-import pathlib
-
-# Ensure backend `app` package is importable when running tests from the tests folder
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
-
 import pytest
 import asyncio
 import httpx
+import orjson
 
 from app.services.api_client import RagApiClient
 
+# rag-qa-api paths, shared by the route tables and the request assertions
+SUBMIT, STATUS, JOBS = "/ingest/submit", "/ingest/status/job-123", "/ingest/jobs"
+INTEGRATIONS, INTEGRATION, JOB_LOGS = "/integrations/", "/integrations/int-1", "/ingest/jobs/job-1/logs"
 
-class DummyResponse:
-    def __init__(self, json_data=None):
-        self._json = json_data or {}
-
-    def raise_for_status(self):
-        return None
-
-    def json(self):
-        return self._json
-
-
-class DummyAsyncClient:
-    def __init__(self, *args, **kwargs):
-        pass
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-    async def post(self, url, json=None, files=None, data=None, timeout=None):
-        return DummyResponse({"url": url, "json": json})
-
-    async def get(self, url, timeout=None):
-        return DummyResponse({"url": url})
-    
-    async def delete(self, url, timeout=None):
-        return DummyResponse({"url": url})
-
-
-@pytest.mark.asyncio
-async def test_etl_submit_and_status_and_jobs(monkeypatch):
-    # Patch httpx.AsyncClient to avoid real HTTP calls
-    monkeypatch.setattr(httpx, "AsyncClient", DummyAsyncClient)
 
+async def test_etl_submit_and_status_and_jobs(routes):
+    routes.post(SUBMIT, json={"job_id": "job-123", "status": "queued"})
+    routes.get(STATUS, json={"job_id": "job-123", "status": "running"})
+    routes.get(JOBS, json={"jobs": []})
     client = RagApiClient(base_url="http://test-server")
 
     # etl_submit
     res = await client.etl_submit("notion", {"fake": "param"})
-    assert "ingest/submit" in res["url"]
-    assert res["json"]["source_type"] == "notion"
+    request = routes.calls[-1]
+    assert request.url.path == SUBMIT
+    assert orjson.loads(request.content)["source_type"] == "notion"
+    assert res["job_id"] == "job-123"
 
     # etl_status
     status = await client.etl_status("job-123")
-    assert "ingest/status/job-123" in status["url"]
+    assert routes.calls[-1].url.path == STATUS
+    assert status["status"] == "running"
 
     # etl_list_jobs
     jobs = await client.etl_list_jobs(limit=10)
-    assert "ingest/jobs" in jobs["url"]
+    request = routes.calls[-1]
+    assert request.url.path == JOBS
+    assert request.url.params["limit"] == "10"
+    assert jobs == {"jobs": []}
 
 
-@pytest.mark.asyncio
-async def test_integration_endpoints_and_job_logs(monkeypatch):
-    monkeypatch.setattr(httpx, "AsyncClient", DummyAsyncClient)
+async def test_integration_endpoints_and_job_logs(routes):
+    routes.post(INTEGRATIONS, json={"id": "int-1", "name": "test-integration"})
+    routes.get(INTEGRATIONS, json=[])
+    routes.delete(INTEGRATION, json={"status": "deleted"})
+    routes.get(JOB_LOGS, json={"logs": []})
     client = RagApiClient(base_url="http://test-server")
 
     payload = {"name": "test-integration", "type": "confluence", "config": {"api_token": "x"}}
     created = await client.create_integration(payload)
-    assert "/integrations/" in created["url"]
-    assert created["json"]["name"] == "test-integration"
+    request = routes.calls[-1]
+    assert request.url.path == INTEGRATIONS
+    assert orjson.loads(request.content)["name"] == "test-integration"
+    assert created["id"] == "int-1"
 
     listed = await client.list_integrations()
-    assert "/integrations/" in listed["url"]
+    assert routes.calls[-1].url.path == INTEGRATIONS
+    assert listed == []
 
     deleted = await client.delete_integration("int-1")
-    assert "/integrations/int-1" in deleted["url"]
+    assert routes.calls[-1].url.path == INTEGRATION
+    assert deleted["status"] == "deleted"
 
     logs = await client.etl_job_logs("job-1")
-    assert "/ingest/jobs/job-1/logs" in logs["url"]
+    assert routes.calls[-1].url.path == JOB_LOGS
+    assert logs == {"logs": []}
+
+
+async def test_upload_file_stream_relays_upload(routes):
+    import io
+    from fastapi import UploadFile
+
+    routes.post("/ingest/upload", json={"status": "success", "total_chunks": 1})
+    client = RagApiClient(base_url="http://test-server")
+
+    upload = UploadFile(file=io.BytesIO(b"hello world"), filename="notes.txt")
+    res = await client.upload_file_stream(upload, chunk_size=500, chunk_overlap=50)
+    request = routes.calls[-1]
+    assert request.url.path == "/ingest/upload"
+    assert b"hello world" in request.content
+    assert res["status"] == "success"
+
+
+async def test_terminal_job_status_is_not_refetched(routes):
+    routes.get("/ingest/status/job-1", json={"job_id": "job-1", "status": "completed"})
+    routes.delete("/ingest/jobs/job-1", json={"status": "deleted"})
+    client = RagApiClient(base_url="http://test-server")
+
+    def status_calls():
+        return sum(1 for request in routes.calls if request.method == "GET")
+
+    first = await client.etl_status("job-1")
+    second = await client.etl_status("job-1", fresh=True)
+    assert first == second == {"job_id": "job-1", "status": "completed"}
+    assert status_calls() == 1
+
+    await client.delete_ingest_job("job-1")
+    await client.etl_status("job-1")
+    assert status_calls() == 2
+
+
+async def test_concurrent_status_polls_share_one_request(routes):
+    routes.get("/ingest/status/job-2", json={"job_id": "job-2", "status": "running"})
+    client = RagApiClient(base_url="http://test-server")
+
+    results = await asyncio.gather(*(client.etl_status("job-2", fresh=True) for _ in range(5)))
+    assert all(r["status"] == "running" for r in results)
+    assert len(routes.calls) == 1
+
+
+@pytest.mark.parametrize("content_type, body, expected", [
+    ("application/json", b'{"detail": "Job not found"}', "API error (404): Job not found"),
+    ("application/json", b"{not json", "API error (404): {not json"),
+    ("text/html", b"<h1>Not Found</h1>", "API error (404): <h1>Not Found</h1>"),
+])
+def test_extract_error_message_reads_json_detail_only(content_type, body, expected):
+    from app.services.api_client import _extract_error_message
+
+    request = httpx.Request("GET", "http://test-server/ingest/status/x")
+    response = httpx.Response(404, headers={"content-type": content_type}, content=body, request=request)
+    error = httpx.HTTPStatusError("not found", request=request, response=response)
+    assert _extract_error_message(error) == expected
+
+
+def test_single_full_featured_client_class():
+    import inspect
+    from app.services import api_client
+
+    classes = [obj for _, obj in inspect.getmembers(api_client, inspect.isclass) if obj.__name__ == "RagApiClient"]
+    assert classes == [RagApiClient]
+    for name in ("etl_status", "etl_list_jobs", "upload_file_stream", "chat_query_stream_raw",
+                 "list_integrations", "create_integration", "delete_integration", "probe"):
+        assert hasattr(RagApiClient, name), name
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from app.services import auth
+
+
+def test_hash_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 4)
+    hashed = auth.get_password_hash("s3cret")
+    assert hashed.startswith("$2b$04$")
+    assert auth.verify_password("s3cret", hashed)
+    assert not auth.verify_password("wrong", hashed)
+
+
+def test_verify_password_rejects_malformed_hash():
+    assert auth.verify_password("s3cret", "not-a-bcrypt-hash") is False
+
+
+def test_default_hash_cost_is_within_budget():
+    # Guards against accidental cost changes; bounds are loose to tolerate slow CI hosts
+    start = time.perf_counter()
+    auth.get_password_hash("s3cret")
+    elapsed = time.perf_counter() - start
+    assert 0.02 < elapsed < 1.5, f"bcrypt cost {auth.BCRYPT_ROUNDS} took {elapsed:.3f}s"
+
+
+async def test_async_password_helpers_round_trip(monkeypatch):
+    monkeypatch.setattr(auth, "BCRYPT_ROUNDS", 4)
+    hashed = await auth.aget_password_hash("s3cret")
+    assert await auth.averify_password("s3cret", hashed)
+    assert not await auth.averify_password("wrong", hashed)
+
+
+def test_access_token_is_standard_hs256_jwt():
+    token = auth.create_access_token({"sub": "interop@example.com"})
+    assert isinstance(token, str)
+    payload = auth.jwt.decode(token, auth.SECRET_KEY, algorithms=["HS256"])
+    assert payload["sub"] == "interop@example.com"
+    assert auth.jwt.get_unverified_header(token)["alg"] == "HS256"
+
+
+@pytest.mark.parametrize("claims", [
+    {"sub": "late@example.com", "exp": 1},
+    {"exp": 4102444800},
+])
+def test_decode_access_token_rejects_expired_or_incomplete(claims):
+    token = auth.jwt.encode(claims, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    assert auth.decode_access_token(token) is None
+
+
+def test_decode_access_token_rejects_foreign_signature():
+    token = auth.jwt.encode({"sub": "x@example.com", "exp": 4102444800}, "a-different-secret-of-sufficient-length", algorithm="HS256")
+    assert auth.decode_access_token(token) is None
+    assert auth.decode_access_token("not.a.jwt") is None
+
+
+async def test_require_roles_allows_listed_roles_and_admins():
+    from types import SimpleNamespace
+    from fastapi import HTTPException
+    from app.services.authorization import require_roles
+
+    checker = require_roles("editor", "reviewer")
+    editor = SimpleNamespace(role="editor", is_admin=False)
+    admin = SimpleNamespace(role="user", is_admin=True)
+    assert await checker(current_user=editor) is editor
+    assert await checker(current_user=admin) is admin
+
+    with pytest.raises(HTTPException) as exc:
+        await checker(current_user=SimpleNamespace(role="user", is_admin=False))
+    assert exc.value.status_code == 403
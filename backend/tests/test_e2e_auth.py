@@ -8,295 +8,135 @@ Tests the complete authentication flow:
 - Profile management
 - Password reset
 """
-import sys
-import pathlib
 import pytest
-import httpx
-from unittest.mock import AsyncMock, MagicMock, patch
 
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
-
-from conftest import MockResponse, MockAsyncClient, RAG_CHAT_UI_BACKEND_URL
+from conftest import TEST_AUTH_TOKEN
 
 
 # =============================================================================
 # Registration Tests
 # =============================================================================
 
+# (request body, mocked status, mocked response body)
+REGISTER_CASES = [
+    pytest.param(
+        {"email": "newuser@example.com", "password": "SecurePass123!", "full_name": "New User"},
+        201,
+        {"id": "user-123", "email": "newuser@example.com", "full_name": "New User", "is_active": True},
+        id="new-user"
+    ),
+    pytest.param(
+        {"email": "existing@example.com", "password": "SecurePass123!"},
+        400,
+        {"detail": "Email already registered"},
+        id="duplicate-email"
+    ),
+    pytest.param(
+        {"email": "not-an-email", "password": "SecurePass123!"},
+        422,
+        {"detail": "Invalid email format"},
+        id="invalid-email"
+    ),
+    pytest.param(
+        {"email": "user@example.com", "password": "123"},  # Too weak
+        422,
+        {"detail": "Password too weak"},
+        id="weak-password"
+    ),
+]
+
+
 class TestUserRegistration:
     """Test user registration flow"""
 
-    @pytest.mark.asyncio
-    async def test_register_new_user_success(self):
-        """Test successful user registration"""
-        mock_responses = {
-            "POST:/auth/register": MockResponse({
-                "id": "user-123",
-                "email": "newuser@example.com",
-                "full_name": "New User",
-                "is_active": True
-            }, status_code=201)
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/register",
-                    json={
-                        "email": "newuser@example.com",
-                        "password": "SecurePass123!",
-                        "full_name": "New User"
-                    }
-                )
-
-        assert response.status_code == 201
-        data = response.json()
-        assert data["email"] == "newuser@example.com"
-        assert "id" in data
-
-    @pytest.mark.asyncio
-    async def test_register_duplicate_email_fails(self):
-        """Test registration with existing email fails"""
-        mock_responses = {
-            "POST:/auth/register": MockResponse(
-                {"detail": "Email already registered"},
-                status_code=400
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/register",
-                    json={
-                        "email": "existing@example.com",
-                        "password": "SecurePass123!"
-                    }
-                )
+    @pytest.mark.parametrize("payload,status,body", REGISTER_CASES)
+    async def test_register(self, payload, status, body, routes, http_client):
+        """Test registration returns the backend's status and body"""
+        routes.post("/auth/register", status, json=body)
 
-        assert response.status_code == 400
-        assert "already registered" in response.json().get("detail", "").lower()
-
-    @pytest.mark.asyncio
-    async def test_register_invalid_email_fails(self):
-        """Test registration with invalid email fails"""
-        mock_responses = {
-            "POST:/auth/register": MockResponse(
-                {"detail": "Invalid email format"},
-                status_code=422
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/register",
-                    json={
-                        "email": "not-an-email",
-                        "password": "SecurePass123!"
-                    }
-                )
-
-        assert response.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_register_weak_password_fails(self):
-        """Test registration with weak password fails"""
-        mock_responses = {
-            "POST:/auth/register": MockResponse(
-                {"detail": "Password too weak"},
-                status_code=422
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/register",
-                    json={
-                        "email": "user@example.com",
-                        "password": "123"  # Too weak
-                    }
-                )
-
-        assert response.status_code == 422
+        response = await http_client.post("/auth/register", json=payload)
+
+        assert response.status_code == status
+        assert response.json() == body
 
 
 # =============================================================================
 # Login Tests
 # =============================================================================
 
+LOGIN_CASES = [
+    pytest.param(
+        {"email": "user@example.com", "password": "correctpassword"},
+        200,
+        {"access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test", "token_type": "bearer"},
+        id="success"
+    ),
+    pytest.param(
+        {"email": "user@example.com", "password": "wrongpassword"},
+        401,
+        {"detail": "Invalid credentials"},
+        id="wrong-password"
+    ),
+    pytest.param(
+        {"email": "nonexistent@example.com", "password": "anypassword"},
+        401,
+        {"detail": "Invalid credentials"},
+        id="nonexistent-user"
+    ),
+]
+
+
 class TestUserLogin:
     """Test user login flow"""
 
-    @pytest.mark.asyncio
-    async def test_login_success(self):
-        """Test successful login returns JWT token"""
-        mock_responses = {
-            "POST:/auth/login": MockResponse({
-                "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.test",
-                "token_type": "bearer"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/login",
-                    json={
-                        "email": "user@example.com",
-                        "password": "correctpassword"
-                    }
-                )
+    @pytest.mark.parametrize("payload,status,body", LOGIN_CASES)
+    async def test_login(self, payload, status, body, routes, http_client):
+        """Test login returns a bearer token or the credential error"""
+        routes.post("/auth/login", status, json=body)
 
-        assert response.status_code == 200
-        data = response.json()
-        assert "access_token" in data
-        assert data["token_type"] == "bearer"
-
-    @pytest.mark.asyncio
-    async def test_login_wrong_password_fails(self):
-        """Test login with wrong password fails"""
-        mock_responses = {
-            "POST:/auth/login": MockResponse(
-                {"detail": "Invalid credentials"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/login",
-                    json={
-                        "email": "user@example.com",
-                        "password": "wrongpassword"
-                    }
-                )
-
-        assert response.status_code == 401
-
-    @pytest.mark.asyncio
-    async def test_login_nonexistent_user_fails(self):
-        """Test login with non-existent user fails"""
-        mock_responses = {
-            "POST:/auth/login": MockResponse(
-                {"detail": "Invalid credentials"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/login",
-                    json={
-                        "email": "nonexistent@example.com",
-                        "password": "anypassword"
-                    }
-                )
-
-        assert response.status_code == 401
+        response = await http_client.post("/auth/login", json=payload)
+
+        assert response.status_code == status
+        assert response.json() == body
 
 
 # =============================================================================
 # Token Validation Tests
 # =============================================================================
 
+# (bearer token or None for no header, mocked status, mocked response body)
+TOKEN_CASES = [
+    pytest.param(
+        TEST_AUTH_TOKEN,
+        200,
+        {"id": "user-123", "email": "user@example.com", "full_name": "Test User"},
+        id="valid"
+    ),
+    pytest.param(None, 401, {"detail": "Not authenticated"}, id="missing"),
+    pytest.param("invalid-token", 401, {"detail": "Invalid token"}, id="invalid"),
+    pytest.param(
+        # Token with past expiration
+        "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJleHAiOjF9.expired",
+        401,
+        {"detail": "Token expired"},
+        id="expired"
+    ),
+]
+
+
 class TestTokenValidation:
     """Test JWT token validation"""
 
-    @pytest.mark.asyncio
-    async def test_valid_token_allows_access(self, authenticated_headers):
-        """Test valid token allows access to protected endpoints"""
-        mock_responses = {
-            "GET:/auth/me": MockResponse({
-                "id": "user-123",
-                "email": "user@example.com",
-                "full_name": "Test User"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me",
-                    headers=authenticated_headers
-                )
+    @pytest.mark.parametrize("token,status,body", TOKEN_CASES)
+    async def test_token(self, token, status, body, routes, http_client):
+        """Test only a valid token gives access to protected endpoints"""
+        routes.get("/auth/me", status, json=body)
 
-        assert response.status_code == 200
-        data = response.json()
-        assert "email" in data
-
-    @pytest.mark.asyncio
-    async def test_missing_token_returns_401(self):
-        """Test missing token returns 401"""
-        mock_responses = {
-            "GET:/auth/me": MockResponse(
-                {"detail": "Not authenticated"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me"
-                    # No Authorization header
-                )
-
-        assert response.status_code == 401
-
-    @pytest.mark.asyncio
-    async def test_invalid_token_returns_401(self):
-        """Test invalid token returns 401"""
-        mock_responses = {
-            "GET:/auth/me": MockResponse(
-                {"detail": "Invalid token"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me",
-                    headers={"Authorization": "Bearer invalid-token"}
-                )
-
-        assert response.status_code == 401
-
-    @pytest.mark.asyncio
-    async def test_expired_token_returns_401(self):
-        """Test expired token returns 401"""
-        mock_responses = {
-            "GET:/auth/me": MockResponse(
-                {"detail": "Token expired"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                # Token with past expiration
-                expired_token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJleHAiOjF9.expired"
-                response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me",
-                    headers={"Authorization": f"Bearer {expired_token}"}
-                )
-
-        assert response.status_code == 401
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = await http_client.get("/auth/me", headers=headers)
+
+        assert response.status_code == status
+        assert response.json() == body
 
 
 # =============================================================================
@@ -306,50 +146,38 @@ class TestTokenValidation:
 class TestProfileManagement:
     """Test user profile management"""
 
-    @pytest.mark.asyncio
-    async def test_get_profile_success(self, authenticated_headers):
+    async def test_get_profile_success(self, authenticated_headers, routes, http_client):
         """Test getting user profile"""
-        mock_responses = {
-            "GET:/auth/me": MockResponse({
-                "id": "user-123",
-                "email": "user@example.com",
-                "full_name": "Test User",
-                "created_at": "2024-01-01T00:00:00Z"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me",
-                    headers=authenticated_headers
-                )
+        routes.get("/auth/me", json={
+            "id": "user-123",
+            "email": "user@example.com",
+            "full_name": "Test User",
+            "created_at": "2024-01-01T00:00:00Z"
+        })
+
+        response = await http_client.get(
+            "/auth/me",
+            headers=authenticated_headers
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert data["email"] == "user@example.com"
         assert "full_name" in data
 
-    @pytest.mark.asyncio
-    async def test_update_profile_success(self, authenticated_headers):
+    async def test_update_profile_success(self, authenticated_headers, routes, http_client):
         """Test updating user profile"""
-        mock_responses = {
-            "PUT:/auth/profile": MockResponse({
-                "id": "user-123",
-                "email": "user@example.com",
-                "full_name": "Updated Name"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/profile",
-                    headers=authenticated_headers,
-                    json={"full_name": "Updated Name"}
-                )
+        routes.put("/auth/profile", json={
+            "id": "user-123",
+            "email": "user@example.com",
+            "full_name": "Updated Name"
+        })
+
+        response = await http_client.put(
+            "/auth/profile",
+            headers=authenticated_headers,
+            json={"full_name": "Updated Name"}
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -363,69 +191,48 @@ class TestProfileManagement:
 class TestPasswordReset:
     """Test password reset flow"""
 
-    @pytest.mark.asyncio
-    async def test_forgot_password_sends_email(self):
+    async def test_forgot_password_sends_email(self, routes, http_client):
         """Test forgot password sends reset email"""
-        mock_responses = {
-            "POST:/auth/forgot-password": MockResponse({
-                "message": "Password reset email sent"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/forgot-password",
-                    json={"email": "user@example.com"}
-                )
+        routes.post("/auth/forgot-password", json={
+            "message": "Password reset email sent"
+        })
+
+        response = await http_client.post(
+            "/auth/forgot-password",
+            json={"email": "user@example.com"}
+        )
 
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_reset_password_success(self, authenticated_headers):
+    async def test_reset_password_success(self, authenticated_headers, routes, http_client):
         """Test password reset with valid token"""
-        mock_responses = {
-            "POST:/auth/reset-password": MockResponse({
-                "message": "Password updated successfully"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/reset-password",
-                    headers=authenticated_headers,
-                    json={
-                        "old_password": "oldpassword",
-                        "new_password": "NewSecurePass123!"
-                    }
-                )
+        routes.post("/auth/reset-password", json={
+            "message": "Password updated successfully"
+        })
+
+        response = await http_client.post(
+            "/auth/reset-password",
+            headers=authenticated_headers,
+            json={
+                "old_password": "oldpassword",
+                "new_password": "NewSecurePass123!"
+            }
+        )
 
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_reset_password_wrong_old_password_fails(self, authenticated_headers):
+    async def test_reset_password_wrong_old_password_fails(self, authenticated_headers, routes, http_client):
         """Test password reset with wrong old password fails"""
-        mock_responses = {
-            "POST:/auth/reset-password": MockResponse(
-                {"detail": "Invalid old password"},
-                status_code=400
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/reset-password",
-                    headers=authenticated_headers,
-                    json={
-                        "old_password": "wrongpassword",
-                        "new_password": "NewSecurePass123!"
-                    }
-                )
+        routes.post("/auth/reset-password", 400, json={"detail": "Invalid old password"})
+
+        response = await http_client.post(
+            "/auth/reset-password",
+            headers=authenticated_headers,
+            json={
+                "old_password": "wrongpassword",
+                "new_password": "NewSecurePass123!"
+            }
+        )
 
         assert response.status_code == 400
 
@@ -435,71 +242,35 @@ class TestPasswordReset:
 # =============================================================================
 
 class TestFullAuthFlow:
-    """Test complete authentication flow end-to-end"""
-
-    @pytest.mark.asyncio
-    async def test_complete_auth_flow(self):
-        """Test: Register -> Login -> Access Protected -> Update Profile -> Logout"""
-
-        # Mock responses for the entire flow
-        mock_responses = {
-            "POST:/auth/register": MockResponse({
-                "id": "new-user-123",
-                "email": "flowtest@example.com"
-            }, status_code=201),
-            "POST:/auth/login": MockResponse({
-                "access_token": "new-jwt-token",
-                "token_type": "bearer"
-            }),
-            "GET:/auth/me": MockResponse({
-                "id": "new-user-123",
-                "email": "flowtest@example.com",
-                "full_name": None
-            }),
-            "PUT:/auth/profile": MockResponse({
-                "id": "new-user-123",
-                "email": "flowtest@example.com",
-                "full_name": "Flow Test User"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                # Step 1: Register
-                register_response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/register",
-                    json={
-                        "email": "flowtest@example.com",
-                        "password": "FlowTestPass123!"
-                    }
-                )
-                assert register_response.status_code == 201
-
-                # Step 2: Login
-                login_response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/login",
-                    json={
-                        "email": "flowtest@example.com",
-                        "password": "FlowTestPass123!"
-                    }
-                )
-                assert login_response.status_code == 200
-                token = login_response.json()["access_token"]
-
-                # Step 3: Access protected endpoint
-                headers = {"Authorization": f"Bearer {token}"}
-                me_response = await client.get(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/me",
-                    headers=headers
-                )
-                assert me_response.status_code == 200
-
-                # Step 4: Update profile
-                profile_response = await client.put(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/auth/profile",
-                    headers=headers,
-                    json={"full_name": "Flow Test User"}
-                )
-                assert profile_response.status_code == 200
-                assert profile_response.json()["full_name"] == "Flow Test User"
+    """Test complete authentication flow end-to-end (register + login via registered_user)"""
+
+    async def test_flow_me(self, registered_user, routes, http_client):
+        """Test: the freshly issued token gives access to the protected profile"""
+        routes.get("/auth/me", json={
+            "id": registered_user["user_id"],
+            "email": registered_user["email"],
+            "full_name": None
+        })
+
+        me_response = await http_client.get("/auth/me", headers=registered_user["headers"])
+
+        assert me_response.status_code == 200
+        assert me_response.json()["id"] == registered_user["user_id"]
+        assert routes.calls[-1].headers["authorization"] == f"Bearer {registered_user['token']}"
+
+    async def test_flow_update_profile(self, registered_user, routes, http_client):
+        """Test: the freshly issued token can update the profile"""
+        routes.put("/auth/profile", json={
+            "id": registered_user["user_id"],
+            "email": registered_user["email"],
+            "full_name": "Flow Test User"
+        })
+
+        profile_response = await http_client.put(
+            "/auth/profile",
+            headers=registered_user["headers"],
+            json={"full_name": "Flow Test User"}
+        )
+
+        assert profile_response.status_code == 200
+        assert profile_response.json()["full_name"] == "Flow Test User"
@@ -10,23 +10,59 @@ Including:
 - Conversation history
 - RAG retrieval integration
 """
-import sys
-import pathlib
 import pytest
-import httpx
 import json
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-
-sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+import httpx
+from types import SimpleNamespace
 
-from conftest import (
-    MockResponse, MockAsyncClient, MockStreamResponse,
-    RAG_CHAT_UI_BACKEND_URL, RAG_QA_API_URL
-)
+from conftest import RAG_QA_API_URL
 from app.services.api_client import RagApiClient
 
 
+# =============================================================================
+# Mocked rag-qa-api Responses
+# =============================================================================
+
+# Built once at import and shared by the tests below (the mock transport only reads them)
+_RESP_BASIC_QUERY = {
+    "answer": "Machine learning is a subset of AI that enables systems to learn from data.",
+    "context_used": True,
+    "conversation_id": "conv-123",
+    "sources": [
+        {
+            "content": "Machine learning is a method of data analysis...",
+            "metadata": {"filename": "ml_intro.pdf", "chunk_id": 1},
+            "score": 0.92
+        }
+    ]
+}
+
+_RESP_CONTINUED_QUERY = {
+    "answer": "Based on our previous discussion, here's more detail...",
+    "context_used": True,
+    "conversation_id": "existing-conv-123"
+}
+
+_RESP_FILTERED_QUERY = {
+    "answer": "From the specific document you mentioned...",
+    "context_used": True,
+    "conversation_id": "conv-456"
+}
+
+_RESP_NO_CONTEXT = {
+    "answer": "I couldn't find relevant information in the knowledge base.",
+    "context_used": False,
+    "conversation_id": "conv-789"
+}
+
+_RESP_CREATIVE_QUERY = {
+    "answer": "A creative response with higher temperature...",
+    "context_used": True,
+    "conversation_id": "conv-creative"
+}
+
+
 # =============================================================================
 # Chat Query Tests (Non-Streaming)
 # =============================================================================
@@ -34,32 +70,15 @@ from app.services.api_client import RagApiClient
 class TestChatQuery:
     """Test non-streaming chat queries"""
 
-    @pytest.mark.asyncio
-    async def test_basic_query_success(self, authenticated_headers, sample_query_request):
+    async def test_basic_query_success(self, authenticated_headers, sample_query_request, routes, http_client):
         """Test basic chat query returns answer with sources"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "Machine learning is a subset of AI that enables systems to learn from data.",
-                "context_used": True,
-                "conversation_id": "conv-123",
-                "sources": [
-                    {
-                        "content": "Machine learning is a method of data analysis...",
-                        "metadata": {"filename": "ml_intro.pdf", "chunk_id": 1},
-                        "score": 0.92
-                    }
-                ]
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
+        routes.post("/chat/query", json=_RESP_BASIC_QUERY)
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json=sample_query_request
-                )
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json=dict(sample_query_request)
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -67,130 +86,81 @@ class TestChatQuery:
         assert data["context_used"] is True
         assert "conversation_id" in data
 
-    @pytest.mark.asyncio
-    async def test_query_with_conversation_id(self, authenticated_headers):
+    async def test_query_with_conversation_id(self, authenticated_headers, routes, http_client):
         """Test query with existing conversation continues context"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "Based on our previous discussion, here's more detail...",
-                "context_used": True,
-                "conversation_id": "existing-conv-123"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "Tell me more about that",
-                        "conversation_id": "existing-conv-123",
-                        "top_k": 5
-                    }
-                )
+        routes.post("/chat/query", json=_RESP_CONTINUED_QUERY)
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "Tell me more about that",
+                "conversation_id": "existing-conv-123",
+                "top_k": 5
+            }
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert data["conversation_id"] == "existing-conv-123"
 
-    @pytest.mark.asyncio
-    async def test_query_with_metadata_filters(self, authenticated_headers):
+    async def test_query_with_metadata_filters(self, authenticated_headers, routes, http_client):
         """Test query with metadata filters for specific documents"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "From the specific document you mentioned...",
-                "context_used": True,
-                "conversation_id": "conv-456"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "What does this document say?",
-                        "metadata_filters": {"filename": "specific_doc.pdf"},
-                        "top_k": 3
-                    }
-                )
+        routes.post("/chat/query", json=_RESP_FILTERED_QUERY)
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "What does this document say?",
+                "metadata_filters": {"filename": "specific_doc.pdf"},
+                "top_k": 3
+            }
+        )
 
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_query_no_relevant_context(self, authenticated_headers):
+    async def test_query_no_relevant_context(self, authenticated_headers, routes, http_client):
         """Test query when no relevant documents found"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "I couldn't find relevant information in the knowledge base.",
-                "context_used": False,
-                "conversation_id": "conv-789"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "What is the meaning of life?",
-                        "top_k": 5
-                    }
-                )
+        routes.post("/chat/query", json=_RESP_NO_CONTEXT)
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "What is the meaning of life?",
+                "top_k": 5
+            }
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert data["context_used"] is False
 
-    @pytest.mark.asyncio
-    async def test_query_with_custom_temperature(self, authenticated_headers):
+    async def test_query_with_custom_temperature(self, authenticated_headers, routes, http_client):
         """Test query with custom temperature setting"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "A creative response with higher temperature...",
-                "context_used": True,
-                "conversation_id": "conv-creative"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "Give me a creative explanation",
-                        "temperature": 0.9,
-                        "max_tokens": 2000
-                    }
-                )
+        routes.post("/chat/query", json=_RESP_CREATIVE_QUERY)
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "Give me a creative explanation",
+                "temperature": 0.9,
+                "max_tokens": 2000
+            }
+        )
 
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_query_requires_authentication(self):
+    async def test_query_requires_authentication(self, routes, http_client):
         """Test query without auth token fails"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse(
-                {"detail": "Not authenticated"},
-                status_code=401
-            )
-        }
-        mock_client = MockAsyncClient(mock_responses)
+        routes.post("/chat/query", 401, json={"detail": "Not authenticated"})
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    json={"question": "Test question"}
-                )
+        response = await http_client.post(
+            "/chat/query",
+            json={"question": "Test question"}
+        )
 
         assert response.status_code == 401
 
@@ -202,8 +172,7 @@ class TestChatQuery:
 class TestChatStreaming:
     """Test streaming chat responses via SSE"""
 
-    @pytest.mark.asyncio
-    async def test_streaming_query_success(self, authenticated_headers):
+    async def test_streaming_query_success(self, authenticated_headers, routes, http_client):
         """Test streaming query returns SSE events"""
         events = [
             'data: {"event": "conversation_id", "conversation_id": "conv-stream-123"}',
@@ -216,35 +185,25 @@ class TestChatStreaming:
             'data: {"type": "done", "data": {}}'
         ]
 
-        class StreamingMockClient(MockAsyncClient):
-            def stream(self, method, url, **kwargs):
-                return MockStreamResponse(events)
-
-        mock_client = StreamingMockClient()
+        routes.sse("/chat/query/stream", events)
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                # Simulate streaming request
-                mock_stream = mock_client.stream(
-                    "POST",
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query/stream",
-                    json={"question": "What is ML?"}
-                )
-
-                collected_events = []
-                async with mock_stream as response:
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            event = json.loads(line[6:])
-                            collected_events.append(event)
+        collected_events = []
+        async with http_client.stream(
+            "POST",
+            "/chat/query/stream",
+            json={"question": "What is ML?"}
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    event = json.loads(line[6:])
+                    collected_events.append(event)
 
         # Verify events
         assert len(collected_events) >= 4
         event_types = [e.get("type") or e.get("event") for e in collected_events]
         assert "conversation_id" in event_types or any(e.get("event") == "conversation_id" for e in collected_events)
 
-    @pytest.mark.asyncio
-    async def test_streaming_collects_full_answer(self, authenticated_headers):
+    async def test_streaming_collects_full_answer(self, authenticated_headers, routes, http_client):
         """Test streaming collects tokens into full answer"""
         events = [
             'data: {"type": "token", "data": {"content": "Hello"}}',
@@ -253,31 +212,23 @@ class TestChatStreaming:
             'data: {"type": "done", "data": {}}'
         ]
 
-        class StreamingMockClient(MockAsyncClient):
-            def stream(self, method, url, **kwargs):
-                return MockStreamResponse(events)
-
-        mock_client = StreamingMockClient()
+        routes.sse("/chat/query/stream", events)
         full_answer = ""
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            mock_stream = mock_client.stream(
-                "POST",
-                f"{RAG_QA_API_URL}/chat/query/stream",
-                json={"question": "Test"}
-            )
-
-            async with mock_stream as response:
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        event = json.loads(line[6:])
-                        if event.get("type") == "token":
-                            full_answer += event["data"]["content"]
+        async with http_client.stream(
+            "POST",
+            f"{RAG_QA_API_URL}/chat/query/stream",
+            json={"question": "Test"}
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    event = json.loads(line[6:])
+                    if event.get("type") == "token":
+                        full_answer += event["data"]["content"]
 
         assert full_answer == "Hello World"
 
-    @pytest.mark.asyncio
-    async def test_streaming_handles_retrieval_events(self, authenticated_headers):
+    async def test_streaming_handles_retrieval_events(self, authenticated_headers, routes, http_client):
         """Test streaming properly handles retrieval phase events"""
         events = [
             'data: {"type": "retrieval_start", "data": {"question": "test query"}}',
@@ -285,66 +236,51 @@ class TestChatStreaming:
             'data: {"type": "generation_start", "data": {}}'
         ]
 
-        class StreamingMockClient(MockAsyncClient):
-            def stream(self, method, url, **kwargs):
-                return MockStreamResponse(events)
-
-        mock_client = StreamingMockClient()
+        routes.sse("/chat/query/stream", events)
         retrieval_started = False
         retrieval_completed = False
         num_docs = 0
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            mock_stream = mock_client.stream(
-                "POST",
-                f"{RAG_QA_API_URL}/chat/query/stream",
-                json={"question": "Test"}
-            )
-
-            async with mock_stream as response:
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        event = json.loads(line[6:])
-                        if event.get("type") == "retrieval_start":
-                            retrieval_started = True
-                        elif event.get("type") == "retrieval_complete":
-                            retrieval_completed = True
-                            num_docs = event["data"]["num_docs"]
+        async with http_client.stream(
+            "POST",
+            f"{RAG_QA_API_URL}/chat/query/stream",
+            json={"question": "Test"}
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    event = json.loads(line[6:])
+                    if event.get("type") == "retrieval_start":
+                        retrieval_started = True
+                    elif event.get("type") == "retrieval_complete":
+                        retrieval_completed = True
+                        num_docs = event["data"]["num_docs"]
 
         assert retrieval_started
         assert retrieval_completed
         assert num_docs == 5
 
-    @pytest.mark.asyncio
-    async def test_streaming_error_handling(self, authenticated_headers):
+    async def test_streaming_error_handling(self, authenticated_headers, routes, http_client):
         """Test streaming handles errors gracefully"""
         events = [
             'data: {"type": "retrieval_start", "data": {}}',
             'data: {"type": "error", "data": {"message": "Connection to LLM failed"}}'
         ]
 
-        class StreamingMockClient(MockAsyncClient):
-            def stream(self, method, url, **kwargs):
-                return MockStreamResponse(events)
-
-        mock_client = StreamingMockClient()
+        routes.sse("/chat/query/stream", events)
         error_received = False
         error_message = ""
 
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            mock_stream = mock_client.stream(
-                "POST",
-                f"{RAG_QA_API_URL}/chat/query/stream",
-                json={"question": "Test"}
-            )
-
-            async with mock_stream as response:
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        event = json.loads(line[6:])
-                        if event.get("type") == "error":
-                            error_received = True
-                            error_message = event["data"]["message"]
+        async with http_client.stream(
+            "POST",
+            f"{RAG_QA_API_URL}/chat/query/stream",
+            json={"question": "Test"}
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    event = json.loads(line[6:])
+                    if event.get("type") == "error":
+                        error_received = True
+                        error_message = event["data"]["message"]
 
         assert error_received
         assert "failed" in error_message.lower()
@@ -357,7 +293,6 @@ class TestChatStreaming:
 class TestRAGPipelineIntegration:
     """Test RAG pipeline integration via api_client"""
 
-    @pytest.mark.asyncio
     async def test_api_client_chat_query(self, mock_rag_api_client):
         """Test RagApiClient.chat_query works correctly"""
         result = await mock_rag_api_client.chat_query(
@@ -369,7 +304,6 @@ class TestRAGPipelineIntegration:
         assert "answer" in result
         assert result["context_used"] is True
 
-    @pytest.mark.asyncio
     async def test_api_client_chat_with_history(self, mock_rag_api_client):
         """Test RagApiClient.chat_with_history for multi-turn conversations"""
         messages = [
@@ -387,30 +321,53 @@ class TestRAGPipelineIntegration:
         # Verify the call was made (result comes from mock)
         assert result is not None
 
-    @pytest.mark.asyncio
-    async def test_api_client_chat_query_stream(self):
-        """Test RagApiClient.chat_query_stream yields events"""
+    async def test_api_client_chat_query_stream_raw(self, routes):
+        """Test RagApiClient.chat_query_stream_raw relays byte chunks unchanged"""
         events = [
             'data: {"type": "token", "data": {"content": "Test"}}',
             'data: {"type": "done", "data": {}}'
         ]
 
-        class StreamingMockClient(MockAsyncClient):
-            def stream(self, method, url, **kwargs):
-                return MockStreamResponse(events)
+        routes.sse("/chat/query/stream", events)
+        client = RagApiClient(base_url="http://mock")
+        body = b"".join([chunk async for chunk in client.chat_query_stream_raw(question="Test")])
+
+        assert body == "".join(event + "\n" for event in events).encode()
 
-        with patch.object(httpx, "AsyncClient", lambda **kw: StreamingMockClient()):
-            client = RagApiClient(base_url="http://mock")
+    async def test_whole_lines_rejoins_event_split_across_chunks(self):
+        """Test an SSE event cut between two transport chunks is relayed as one line"""
+        from app.services.chat_service import _whole_lines, _token_content, _decode_answer
 
-            collected = []
-            async for line in client.chat_query_stream(
-                question="Test",
-                top_k=5
-            ):
-                collected.append(line)
+        event = b'data: {"type": "token", "data": {"content": "Hello"}}\n'
+        chunks = [b'data: {"type": "retrieval_start", "data": {}}\n' + event[:20], event[20:] + b'data: {"type": "do', b'ne", "data": {}}']
 
-        assert len(collected) == 2
-        assert "token" in collected[0]
+        async def upstream():
+            for chunk in chunks:
+                yield chunk
+
+        blocks = [block async for block in _whole_lines(upstream())]
+
+        assert b"".join(blocks) == b"".join(chunks)
+        assert all(block.endswith(b"\n") for block in blocks[:-1])
+        assert blocks[1] == event
+        lines = [line for block in blocks for line in block.split(b"\n")]
+        assert _decode_answer([_token_content(line) for line in lines]) == "Hello"
+
+    def test_token_content_extracts_only_token_events(self):
+        """Test the byte-level SSE scan used to rebuild the streamed answer"""
+        from app.services.chat_service import _token_content, _decode_answer
+
+        assert _token_content(b'data: {"type": "token", "data": {"content": "Hi"}}') == b"Hi"
+        assert _token_content(b'data: {"type": "done", "data": {}}') == b""
+        assert _token_content(b'data: {"type": "retrieval_complete", "data": {"content": "x"}}') == b""
+        assert _token_content(b"data: not-json") == b""
+        assert _token_content(b"") == b""
+
+        parts = [
+            _token_content(b'data: {"type": "token", "data": {"content": "say \\"hi\\""}}'),
+            _token_content(b'data: {"type": "token", "data": {"content": " caf\\u00e9\\n"}}'),
+        ]
+        assert _decode_answer(parts) == 'say "hi" caf\u00e9\n'
 
 
 # =============================================================================
@@ -420,29 +377,23 @@ class TestRAGPipelineIntegration:
 class TestHyDEIntegration:
     """Test HyDE feature integration"""
 
-    @pytest.mark.asyncio
-    async def test_query_with_hyde_enabled(self, authenticated_headers):
+    async def test_query_with_hyde_enabled(self, authenticated_headers, routes, http_client):
         """Test query with HyDE improves retrieval"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "Using HyDE, I found more relevant context...",
-                "context_used": True,
-                "conversation_id": "conv-hyde"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "Explain quantum computing",
-                        "use_hyde": True,
-                        "top_k": 5
-                    }
-                )
+        routes.post("/chat/query", json={
+            "answer": "Using HyDE, I found more relevant context...",
+            "context_used": True,
+            "conversation_id": "conv-hyde"
+        })
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "Explain quantum computing",
+                "use_hyde": True,
+                "top_k": 5
+            }
+        )
 
         assert response.status_code == 200
 
@@ -454,95 +405,140 @@ class TestHyDEIntegration:
 class TestFullChatFlow:
     """Test complete chat flow scenarios"""
 
-    @pytest.mark.asyncio
-    async def test_multi_turn_conversation_flow(self, authenticated_headers):
+    async def test_multi_turn_conversation_flow(self, authenticated_headers, routes, http_client):
         """Test multiple turns in a conversation maintain context"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "First response about ML...",
-                "context_used": True,
-                "conversation_id": "conv-multi-turn"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                # Turn 1
-                response1 = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={"question": "What is machine learning?"}
-                )
-                conv_id = response1.json()["conversation_id"]
-
-                # Turn 2 - continue conversation
-                mock_responses["POST:/chat/query"] = MockResponse({
-                    "answer": "Based on our ML discussion, deep learning is...",
-                    "context_used": True,
-                    "conversation_id": conv_id
-                })
-
-                response2 = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "How does deep learning relate to that?",
-                        "conversation_id": conv_id
-                    }
-                )
+        routes.post("/chat/query", json={
+            "answer": "First response about ML...",
+            "context_used": True,
+            "conversation_id": "conv-multi-turn"
+        })
+
+        # Turn 1
+        response1 = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={"question": "What is machine learning?"}
+        )
+        conv_id = response1.json()["conversation_id"]
+
+        # Turn 2 - continue conversation
+        routes.post("/chat/query", json={
+            "answer": "Based on our ML discussion, deep learning is...",
+            "context_used": True,
+            "conversation_id": conv_id
+        })
+
+        response2 = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "How does deep learning relate to that?",
+                "conversation_id": conv_id
+            }
+        )
 
         assert response1.status_code == 200
         assert response2.status_code == 200
         assert response2.json()["conversation_id"] == conv_id
 
-    @pytest.mark.asyncio
-    async def test_query_with_score_threshold(self, authenticated_headers):
+    async def test_query_with_score_threshold(self, authenticated_headers, routes, http_client):
         """Test query with minimum score threshold"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "Only high-confidence results...",
-                "context_used": True,
-                "conversation_id": "conv-threshold"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "Precise technical question",
-                        "score_threshold": 0.8,
-                        "top_k": 3
-                    }
-                )
+        routes.post("/chat/query", json={
+            "answer": "Only high-confidence results...",
+            "context_used": True,
+            "conversation_id": "conv-threshold"
+        })
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "Precise technical question",
+                "score_threshold": 0.8,
+                "top_k": 3
+            }
+        )
 
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_query_with_system_instruction(self, authenticated_headers):
+    async def test_query_with_system_instruction(self, authenticated_headers, routes, http_client):
         """Test query with custom system instruction"""
-        mock_responses = {
-            "POST:/chat/query": MockResponse({
-                "answer": "As a technical expert, I can explain...",
-                "context_used": True,
-                "conversation_id": "conv-system"
-            })
-        }
-        mock_client = MockAsyncClient(mock_responses)
-
-        with patch.object(httpx, "AsyncClient", return_value=mock_client):
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAG_CHAT_UI_BACKEND_URL}/chat/query",
-                    headers=authenticated_headers,
-                    json={
-                        "question": "Explain this concept",
-                        "system_instruction": "You are a technical expert. Provide detailed explanations."
-                    }
-                )
+        routes.post("/chat/query", json={
+            "answer": "As a technical expert, I can explain...",
+            "context_used": True,
+            "conversation_id": "conv-system"
+        })
+
+        response = await http_client.post(
+            "/chat/query",
+            headers=authenticated_headers,
+            json={
+                "question": "Explain this concept",
+                "system_instruction": "You are a technical expert. Provide detailed explanations."
+            }
+        )
 
         assert response.status_code == 200
+
+
+# =============================================================================
+# Chat History Persistence Tests
+# =============================================================================
+
+@pytest.fixture
+def chat_store(monkeypatch):
+    """Keep ChatService's message writes in memory for a single new conversation"""
+    from app.services import chat_service
+
+    store = {"messages": [], "message_count": 0}
+
+    class StoredMessage(SimpleNamespace):
+        async def insert(self):
+            store["messages"].append(self)
+
+        @staticmethod
+        async def insert_many(messages):
+            store["messages"].extend(messages)
+
+    class StoredConversation:
+        @staticmethod
+        async def record_messages(conversation_id, count=1, at=None):
+            store["message_count"] += count
+
+    async def resolve_conversation(self, conversation_id, user, question, now):
+        return "conv-persist"
+
+    monkeypatch.setattr(chat_service, "Message", StoredMessage)
+    monkeypatch.setattr(chat_service, "Conversation", StoredConversation)
+    monkeypatch.setattr(chat_service.ChatService, "_resolve_conversation", resolve_conversation)
+    return store
+
+
+class TestChatHistoryPersistence:
+    """Test what ChatService.query writes to the conversation history"""
+
+    async def test_query_saves_question_and_answer(self, routes, chat_store):
+        """Test a successful turn stores the question and the reply"""
+        from app.services.chat_service import ChatService
+
+        routes.post("/chat/", json=_RESP_BASIC_QUERY)
+        service = ChatService(api_client=RagApiClient(base_url=RAG_QA_API_URL))
+        await service.query("What is machine learning?", user=SimpleNamespace())
+
+        assert [(m.role, m.content) for m in chat_store["messages"]] == [
+            ("user", "What is machine learning?"),
+            ("assistant", _RESP_BASIC_QUERY["answer"]),
+        ]
+        assert chat_store["message_count"] == 2
+
+    async def test_query_keeps_question_when_upstream_fails(self, routes, chat_store):
+        """Test the question is still saved when rag-qa-api returns an error"""
+        from app.services.chat_service import ChatService
+
+        routes.post("/chat/", 500, json={"detail": "upstream failure"})
+        service = ChatService(api_client=RagApiClient(base_url=RAG_QA_API_URL))
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.query("Will this survive?", user=SimpleNamespace())
+
+        assert [(m.role, m.content) for m in chat_store["messages"]] == [("user", "Will this survive?")]
+        assert chat_store["message_count"] == 1
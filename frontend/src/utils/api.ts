@@ -148,12 +148,15 @@ export const chatApi = {
                 throw new Error('No response body');
             }
 
+            // Reads can end mid-line (or mid-character); keep the tail until its newline arrives
+            let buffer = '';
+
             while (true) {
                 const { done, value } = await reader.read();
-                if (done) break;
+                buffer += done ? decoder.decode() : decoder.decode(value, { stream: true });
 
-                const chunk = decoder.decode(value);
-                const lines = chunk.split('\n');
+                const lines = buffer.split('\n');
+                buffer = done ? '' : lines.pop() ?? '';
 
                 for (const line of lines) {
                     if (line.startsWith('data: ')) {
@@ -165,6 +168,8 @@ export const chatApi = {
                         }
                     }
                 }
+
+                if (done) break;
             }
         } catch (error) {
             const err = error instanceof Error ? error : new Error('Streaming failed');